@@ -0,0 +1,22 @@
+from typing import List, Dict, Optional, Union
+import pandas as pd
+
+_DATE_COLUMNS = ("entry_date", "exit_date")
+
+def to_frame(trades: Optional[Union[List[Dict], pd.DataFrame]]) -> pd.DataFrame:
+    """
+    Build the trades DataFrame once for the analytics pipeline.
+
+    Accepts trade dicts or an existing DataFrame (not copied) and makes sure
+    date columns are datetime64 so downstream helpers never re-parse them.
+    """
+    if trades is None:
+        return pd.DataFrame()
+    df = trades if isinstance(trades, pd.DataFrame) else pd.DataFrame(trades)
+
+    parsed = {
+        col: pd.to_datetime(df[col])
+        for col in _DATE_COLUMNS
+        if col in df.columns and df[col].dtype.kind != "M"
+    }
+    return df.assign(**parsed) if parsed else df
@@ -1,8 +1,12 @@
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Mapping, Tuple, Union
+import numpy as np
 import pandas as pd
 from .breakdown import analyze_by_strategy
 
-def calculate_strategy_scores(trades: List[Dict]) -> Dict[str, float]:
+_SCORE_CACHE_SIZE = 8
+
+def calculate_strategy_scores(trades: Union[List[Dict], Mapping[str, np.ndarray]]) -> Dict[str, float]:
     """
     Calculate adaptive score (0-100) for each strategy.
     
@@ -11,43 +15,35 @@ def calculate_strategy_scores(trades: List[Dict]) -> Dict[str, float]:
     - Profit Factor Score (0-3 -> 0-100) * 0.3
     - Avg PnL/Risk Ratio (0-100) * 0.3 (Simulated by simple PnL consistency)
     
+    Accepts trade dicts or a mapping of column arrays (see
+    TradeRepository.get_closed_trade_columns).
+    
     Returns:
         Dict {strategy_name: score}
     """
-    if not trades:
+    if trades is None or len(trades) == 0:
+        return {}
+    
+    # Only strategy and PnL feed the score, so they form an exact cache key
+    if isinstance(trades, Mapping):
+        key = tuple(zip(np.asarray(trades["strategy"]).tolist(), np.asarray(trades["pnl_rupiah"]).tolist()))
+    else:
+        key = tuple((t.get("strategy"), t.get("pnl_rupiah")) for t in trades)
+    if not key:
         return {}
-        
-    stats = analyze_by_strategy(trades)
+    return dict(_scores_for(key))
+
+@lru_cache(maxsize=_SCORE_CACHE_SIZE)
+def _scores_for(key: Tuple[Tuple[Any, Any], ...]) -> Dict[str, float]:
+    """Memoized scoring for a (strategy, pnl_rupiah) trade digest."""
+    stats = analyze_by_strategy(pd.DataFrame(key, columns=["strategy", "pnl_rupiah"]))
     if stats.empty:
         return {}
-        
-    scores = {}
-    for _, row in stats.iterrows():
-        strategy = row["strategy"]
-        
-        # 1. Win Rate Score (Direct percentage)
-        wr_score = row["win_rate"]
-        
-        # 2. Profit Factor Score (Cap at 3.0 = 100)
-        # PF 1.0 = 33, 2.0 = 66, 3.0 = 100
-        pf = row.get("profit_factor", 0)
-        if pf == float('inf'): pf = 3.0
-        pf_score = min(pf / 3.0 * 100, 100)
-        
-        # 3. Consistency/profitability
-        # If total_pnl > 0 -> higher score
-        # Simple heuristic: if profitable, score 100, else 0 for this component?
-        # Better: Win Rate/PF already covers profitability.
-        # Let's add trade count weight? No, score should efficiency.
-        
-        # Let's use simple weighted sum of WR and PF for now as per plan
-        # Plan said: WR(40), RR(30), PF(30).
-        # We don't have RR in breakdown yet. Breakdown has avg_pnl.
-        # We can approximate RR if we had avg_win / avg_loss.
-        # Breakdown has gross_profit/gross_loss but not avg.
-        # Let's simple model: 50% WR + 50% PF Scaled.
-        
-        final_score = (wr_score * 0.5) + (pf_score * 0.5)
-        scores[strategy] = round(final_score, 1)
-        
-    return scores
+    
+    # Simple model: 50% Win Rate + 50% Profit Factor scaled (cap at 3.0 = 100)
+    # PF 1.0 = 33, 2.0 = 66, 3.0 = 100
+    pf = stats["profit_factor"].replace(np.inf, 3.0)
+    pf_score = (pf / 3.0 * 100).clip(upper=100)
+    final_score = stats["win_rate"] * 0.5 + pf_score * 0.5
+    
+    return {strategy: round(score, 1) for strategy, score in zip(stats["strategy"], final_score.tolist())}
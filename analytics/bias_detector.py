@@ -1,31 +1,48 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional, Union
+import numpy as np
 import pandas as pd
 
-def detect_biases(trades: List[Dict]) -> List[str]:
+from ._frame import to_frame
+
+def detect_biases(trades: Union[List[Dict], pd.DataFrame, Mapping[str, np.ndarray]]) -> List[str]:
     """
     Detect behavioral biases from trade history.
     
+    Args:
+        trades: Trade dicts, a trades DataFrame (used as-is, not copied back to
+            dicts) or a mapping of column arrays such as
+            TradeRepository.get_closed_trade_columns().
+    
     Returns:
         List of warning strings describing detected biases.
     """
     biases = []
-    if not trades or len(trades) < 5:
+    if trades is None:
+        return biases
+    columns = isinstance(trades, Mapping)
+    n_trades = len(trades["pnl_rupiah"]) if columns else len(trades)
+    if n_trades < 5:
         return biases
         
-    df = pd.DataFrame(trades)
-    df = df.sort_values("exit_date")
+    # Only per-group means are taken below, so row order does not matter
+    cols = trades if columns else to_frame(trades)
     
-    # Calculate Holding Periods if not present
-    if "holding_days" not in df.columns and "entry_date" in df.columns and "exit_date" in df.columns:
-         df["holding_days"] = (pd.to_datetime(df["exit_date"]) - pd.to_datetime(df["entry_date"])).dt.days
+    # Calculate Holding Periods if not present (to_frame already parsed the dates)
+    hold = None
+    if "holding_days" in cols:
+        hold = np.asarray(cols["holding_days"], dtype=np.float64)
+    elif "entry_date" in cols and "exit_date" in cols:
+        exit_date = pd.to_datetime(pd.Series(cols["exit_date"]))
+        entry_date = pd.to_datetime(pd.Series(cols["entry_date"]))
+        hold = (exit_date - entry_date).dt.days.to_numpy(dtype=np.float64)
     
     # 1. Loss Aversion (Holding Losers > 2x Winners)
-    wins = df[df["pnl_rupiah"] > 0]
-    losses = df[df["pnl_rupiah"] <= 0]
+    is_win = np.asarray(cols["pnl_rupiah"], dtype=np.float64) > 0
+    n_wins = int(is_win.sum())
     
-    if not wins.empty and not losses.empty and "holding_days" in df.columns:
-        avg_hold_win = wins["holding_days"].mean()
-        avg_hold_loss = losses["holding_days"].mean()
+    if hold is not None and 0 < n_wins < len(is_win):
+        avg_hold_win = np.nanmean(hold[is_win])
+        avg_hold_loss = np.nanmean(hold[~is_win])
         
         if avg_hold_loss > 2 * avg_hold_win and avg_hold_loss > 5:
             biases.append(f"Loss Aversion: Avg hold loss ({avg_hold_loss:.1f}d) is >2x wins ({avg_hold_win:.1f}d).")
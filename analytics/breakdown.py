@@ -1,82 +1,106 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
+import numpy as np
 import pandas as pd
 
-def _calculate_metrics(group_df: pd.DataFrame) -> Dict[str, Any]:
-    """Helper to calc metrics for a group of trades."""
-    total_trades = len(group_df)
-    if total_trades == 0:
-        return {}
-        
-    wins = group_df[group_df["pnl_rupiah"] > 0]
-    losses = group_df[group_df["pnl_rupiah"] <= 0]
+from utils.jit import njit
+from ._frame import to_frame
+
+_HOLDING_EDGES = np.array([7, 14, 30])
+_HOLDING_MAX_DAYS = 999
+_HOLDING_LABELS = ("1-7d", "8-14d", "15-30d", ">30d")
+
+@njit(cache=True)
+def _metrics_kernel(codes, pnl, n_groups):
+    """One pass over (group code, pnl) pairs; code -1 (missing key) is skipped.
+
+    Returns per-group arrays: trades, wins, total_pnl, gross_profit, gross_loss.
+    """
+    trades = np.zeros(n_groups, dtype=np.int64)
+    wins = np.zeros(n_groups, dtype=np.int64)
+    total = np.zeros(n_groups, dtype=np.float64)
+    gross_profit = np.zeros(n_groups, dtype=np.float64)
+    gross_loss = np.zeros(n_groups, dtype=np.float64)
+    for i in range(codes.shape[0]):
+        g = codes[i]
+        if g < 0:
+            continue
+        v = pnl[i]
+        trades[g] += 1
+        total[g] += v
+        if v > 0:
+            wins[g] += 1
+            gross_profit[g] += v
+        else:
+            gross_loss[g] -= v
+    return trades, wins, total, gross_profit, gross_loss
+
+def _aggregate_metrics(df: pd.DataFrame, col: str, label: str) -> pd.DataFrame:
+    """Per-group trade metrics for every `col` value in one pass."""
+    codes, keys = pd.factorize(df[col], sort=True)
+    pnl = df["pnl_rupiah"].to_numpy(dtype=np.float64)
+    trades, wins, total, gross_profit, gross_loss = _metrics_kernel(
+        codes.astype(np.int64), pnl, len(keys)
+    )
     
-    win_rate = (len(wins) / total_trades) * 100
-    total_pnl = group_df["pnl_rupiah"].sum()
-    avg_pnl = group_df["pnl_rupiah"].mean()
+    # No losing PnL in the group -> infinite profit factor
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profit_factor = np.where(gross_loss > 0, gross_profit / gross_loss, np.inf)
     
-    gross_profit = wins["pnl_rupiah"].sum()
-    gross_loss = abs(losses["pnl_rupiah"].sum())
-    profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
+    # Keep integer PnL integer, as a pandas sum would
+    total_pnl = total.astype(np.int64) if df["pnl_rupiah"].dtype.kind in "iu" else total
     
-    return {
-        "trades": total_trades,
-        "win_rate": round(win_rate, 1),
+    observed = trades > 0
+    out = pd.DataFrame({
+        "trades": trades,
+        "win_rate": np.round(wins / np.maximum(trades, 1) * 100, 1),
         "total_pnl": total_pnl,
-        "avg_pnl": avg_pnl,
-        "profit_factor": round(profit_factor, 2)
-    }
+        "avg_pnl": total / np.maximum(trades, 1),
+        "profit_factor": np.round(profit_factor, 2),
+    })
+    out[label] = np.asarray(keys)
+    return out[observed].reset_index(drop=True)
 
-def analyze_by_strategy(trades: List[Dict]) -> pd.DataFrame:
-    """Breakdown by strategy name."""
-    if not trades: return pd.DataFrame()
-    df = pd.DataFrame(trades)
+def analyze_by_strategy(trades: Union[List[Dict], pd.DataFrame]) -> pd.DataFrame:
+    """Breakdown by strategy name. Accepts trade dicts or a trades DataFrame."""
+    df = to_frame(trades)
+    if df.empty: return pd.DataFrame()
     
-    results = []
-    for strategy, group in df.groupby("strategy"):
-        metrics = _calculate_metrics(group)
-        metrics["strategy"] = strategy
-        results.append(metrics)
-        
-    return pd.DataFrame(results).sort_values("total_pnl", ascending=False)
+    return _aggregate_metrics(df, "strategy", "strategy").sort_values("total_pnl", ascending=False)
 
-def analyze_by_sector(trades: List[Dict], sector_map: Dict[str, str]) -> pd.DataFrame:
+def analyze_by_sector(trades: Union[List[Dict], pd.DataFrame], sector_map: Dict[str, str]) -> pd.DataFrame:
     """
     Breakdown by sector.
     Requires sector_map dict {symbol: sector_name}.
     """
-    if not trades: return pd.DataFrame()
-    df = pd.DataFrame(trades)
+    df = to_frame(trades)
+    if df.empty: return pd.DataFrame()
     
-    # Map sectors
-    df["sector"] = df["symbol"].map(sector_map).fillna("Unknown")
+    # Map each distinct symbol once; the trailing slot covers missing symbols (code -1)
+    sym_codes, symbols = pd.factorize(df["symbol"])
+    lookup = [sector_map.get(sym) for sym in symbols] + [None]
+    lookup = np.array(["Unknown" if sec is None else sec for sec in lookup], dtype=object)
+    sec_codes, sectors = pd.factorize(lookup, sort=True)
+    df = df.assign(sector=pd.Categorical.from_codes(sec_codes[sym_codes], categories=sectors))
     
-    results = []
-    for sector, group in df.groupby("sector"):
-        metrics = _calculate_metrics(group)
-        metrics["sector"] = sector
-        results.append(metrics)
-        
-    return pd.DataFrame(results).sort_values("total_pnl", ascending=False)
+    return _aggregate_metrics(df, "sector", "sector").sort_values("total_pnl", ascending=False)
 
-def analyze_by_holding_period(trades: List[Dict]) -> pd.DataFrame:
+def analyze_by_holding_period(trades: Union[List[Dict], pd.DataFrame]) -> pd.DataFrame:
     """Breakdown by holding period bins."""
-    if not trades: return pd.DataFrame()
-    df = pd.DataFrame(trades)
+    df = to_frame(trades)
+    if df.empty: return pd.DataFrame()
     
     # Ensure holding_days exists
     if "holding_days" not in df.columns:
         # fallback simple calculation if entry/exit dates exist
         pass 
         
-    bins = [0, 7, 14, 30, 999]
-    labels = ["1-7d", "8-14d", "15-30d", ">30d"]
+    # Right-closed bins (0,7], (7,14], (14,30], (30,999]; anything else is dropped
+    hd = df["holding_days"].to_numpy(dtype=np.float64)
+    valid = (hd > 0) & (hd <= _HOLDING_MAX_DAYS)
+    df = df.loc[valid].assign(
+        period_bin=np.searchsorted(_HOLDING_EDGES, hd[valid], side="left")
+    )
     
-    df["period_bin"] = pd.cut(df["holding_days"], bins=bins, labels=labels)
-    
-    results = []
-    for bin_label, group in df.groupby("period_bin", observed=True):
-        metrics = _calculate_metrics(group)
-        metrics["period"] = bin_label
-        results.append(metrics)
-        
-    return pd.DataFrame(results)
+    out = _aggregate_metrics(df, "period_bin", "period")
+    out["period"] = [_HOLDING_LABELS[i] for i in out["period"]]
+    return out
@@ -1,54 +1,50 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
-def calculate_equity_curve(trades: List[Dict], initial_capital: float) -> List[Dict[str, Any]]:
+from ._frame import to_frame
+
+def calculate_equity_curve(trades: Union[List[Dict], pd.DataFrame], initial_capital: float) -> List[Dict[str, Any]]:
     """
     Calculate equity curve and drawdown from trade history.
     
     Args:
-        trades: List of trade dictionaries (must contain 'exit_date' and 'pnl_rupiah')
+        trades: Trade dicts or a trades DataFrame (must contain 'exit_date' and 'pnl_rupiah')
         initial_capital: Starting capital amount
         
     Returns:
         List of daily equity points sorted by date.
     """
-    if not trades:
+    df = to_frame(trades)
+    if df.empty:
         return []
         
-    # Create DataFrame
-    df = pd.DataFrame(trades)
-    
-    # Ensure datetime
-    if "exit_date" in df.columns:
-        df["exit_date"] = pd.to_datetime(df["exit_date"])
-        
     # Sort by exit date
     df = df.sort_values("exit_date")
     
-    equity = initial_capital
-    peak_equity = initial_capital
-    curve = []
+    # Prefix-sum equity on top of the starting capital (index 0 = start)
+    pnl = df["pnl_rupiah"].to_numpy(dtype=np.float64) if "pnl_rupiah" in df.columns else np.zeros(len(df))
+    equity = np.empty(len(pnl) + 1, dtype=np.float64)
+    equity[0] = initial_capital
+    np.cumsum(pnl, out=equity[1:])
+    equity[1:] += initial_capital
+    
+    peak = np.maximum.accumulate(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(peak > 0, (peak - equity) / peak * 100, 0.0)
     
     # Starting point
-    curve.append({
+    curve = [{
         "date": df["exit_date"].min() - pd.Timedelta(days=1), # Yesterday
         "equity": initial_capital,
         "drawdown_pct": 0.0
-    })
+    }]
+    curve.extend(pd.DataFrame({
+        "date": df["exit_date"].reset_index(drop=True),
+        "equity": equity[1:],
+        "drawdown_pct": drawdown[1:],
+        "trade_pnl": pnl,
+    }).to_dict("records"))
     
-    for _, trade in df.iterrows():
-        pnl = trade.get("pnl_rupiah", 0)
-        equity += pnl
-        
-        peak_equity = max(peak_equity, equity)
-        drawdown = (peak_equity - equity) / peak_equity * 100 if peak_equity > 0 else 0
-        
-        curve.append({
-            "date": trade["exit_date"],
-            "equity": equity,
-            "drawdown_pct": drawdown,
-            "trade_pnl": pnl
-        })
-        
     return curve
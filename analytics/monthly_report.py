@@ -1,14 +1,58 @@
-from typing import List, Dict
+import hashlib
+from typing import List, Dict, Optional, Union
+import numpy as np
 import pandas as pd
 from datetime import datetime
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from fpdf import FPDF
 import tempfile
+import threading
 import os
 
+from ._frame import to_frame
 from .breakdown import analyze_by_strategy
 from .bias_detector import detect_biases
 
+# One headless figure reused for every report chart (no pyplot state machine)
+_CHART_FIG = Figure(figsize=(6, 3))
+_CHART_CANVAS = FigureCanvasAgg(_CHART_FIG)
+_CHART_LOCK = threading.Lock()
+
+# Rendered reports keyed by (year, month, month signature); a finished month's
+# output is deterministic, so it is only rebuilt when its closed trades change.
+# The signature is content-based, so edits from other processes (dashboard) count too.
+_REPORT_CACHE_SIZE = 64
+_MD_CACHE: Dict[tuple, str] = {}
+_PDF_CACHE: Dict[tuple, bytes] = {}
+
+
+# Columns that identify a trade or feed the rendered report (summary, chart,
+# strategy breakdown, bias checks, trade log); an edit to any of them re-renders
+_SIGNATURE_COLUMNS = (
+    "id", "updated_at", "symbol", "strategy", "emotion_tag", "entry_date", "exit_date",
+    "pnl_rupiah", "pnl_percent", "holding_days", "position_size", "capital_at_risk", "sector",
+)
+
+
+def _month_signature(df: pd.DataFrame) -> str:
+    """Content hash of a month's closed trades over the columns the report uses."""
+    cols = [c for c in _SIGNATURE_COLUMNS if c in df.columns]
+    row_hashes = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+
+
+def _cache_put(cache: Dict, key: tuple, value) -> None:
+    if len(cache) >= _REPORT_CACHE_SIZE:
+        cache.pop(next(iter(cache))) # evict oldest
+    cache[key] = value
+
+
+def clear_report_cache() -> None:
+    """Drop cached markdown and PDF reports."""
+    _MD_CACHE.clear()
+    _PDF_CACHE.clear()
+
 class PDFReport(FPDF):
     def header(self):
         self.set_font('Arial', 'B', 15)
@@ -20,6 +64,21 @@ class PDFReport(FPDF):
         self.set_font('Arial', 'I', 8)
         self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
 
+def _render_pnl_chart(dates, cum_pnl, path: str) -> None:
+    """Draw the cumulative PnL line to a PNG at `path` on the shared figure."""
+    with _CHART_LOCK:
+        _CHART_FIG.clear()
+        ax = _CHART_FIG.add_subplot(111)
+        ax.plot(dates, cum_pnl, marker='o', linestyle='-')
+        ax.set_title("Cumulative PnL (Month)")
+        ax.set_xlabel("Date")
+        ax.set_ylabel("PnL (Rp)")
+        ax.grid(True)
+        _CHART_FIG.autofmt_xdate()
+        # Fixed margins instead of the tight_layout solver
+        _CHART_FIG.subplots_adjust(left=0.15, right=0.97, top=0.9, bottom=0.3)
+        _CHART_CANVAS.print_png(path)
+
 def generate_monthly_report(trades: List[Dict], month: int, year: int) -> str:
     """
     Generate markdown report for a specific month.
@@ -32,29 +91,35 @@ def generate_monthly_report(trades: List[Dict], month: int, year: int) -> str:
 
 # I'll overwrite the file to include both functions, reusing logic.
 
-def _get_monthly_df(trades: List[Dict], month: int, year: int) -> pd.DataFrame:
-    if not trades:
-        return pd.DataFrame()
-    df = pd.DataFrame(trades)
-    if "exit_date" in df.columns:
-        df["exit_date"] = pd.to_datetime(df["exit_date"])
-    return df[
-        (df["exit_date"].dt.month == month) & 
-        (df["exit_date"].dt.year == year)
-    ]
+def _get_monthly_df(trades: Union[List[Dict], pd.DataFrame], month: int, year: int) -> pd.DataFrame:
+    df = to_frame(trades)
+    if df.empty:
+        return df
+    
+    # Single month-resolution compare instead of separate .dt.month/.dt.year masks
+    exit_dates = df["exit_date"]
+    if exit_dates.dt.tz is not None:
+        exit_dates = exit_dates.dt.tz_localize(None) # keep wall-clock month
+    month_key = np.datetime64(f"{year:04d}-{month:02d}", "M")
+    return df[exit_dates.to_numpy().astype("datetime64[M]") == month_key]
 
 def generate_markdown_report(trades: List[Dict], month: int, year: int) -> str:
     df = _get_monthly_df(trades, month, year)
     if df.empty:
         return f"No trades found for {month}/{year}."
         
+    key = (year, month, _month_signature(df))
+    cached = _MD_CACHE.get(key)
+    if cached is not None:
+        return cached
+        
     total_trades = len(df)
     total_pnl = df["pnl_rupiah"].sum()
     wins = len(df[df["pnl_rupiah"] > 0])
     win_rate = (wins / total_trades) * 100 if total_trades > 0 else 0
     
-    strat_stats = analyze_by_strategy(df.to_dict("records"))
-    biases = detect_biases(df.to_dict("records"))
+    strat_stats = analyze_by_strategy(df)
+    biases = detect_biases(df)
     
     report = [
         f"# Monthly Trading Report: {month}/{year}",
@@ -75,16 +140,30 @@ def generate_markdown_report(trades: List[Dict], month: int, year: int) -> str:
     else:
         report.append("- No significant biases detected.")
     
-    return "\n".join(report)
+    markdown = "\n".join(report)
+    _cache_put(_MD_CACHE, key, markdown)
+    return markdown
+
+def pdf_report_filename(month: int, year: int) -> str:
+    """Attachment name for a monthly PDF report."""
+    return f"report_{year}_{month}.pdf"
 
-def generate_pdf_report(trades: List[Dict], month: int, year: int) -> str:
+def generate_pdf_report(trades: List[Dict], month: int, year: int) -> Optional[bytes]:
     """
-    Generate PDF report and return file path.
+    Generate PDF report and return its bytes (None if the month has no trades).
+    
+    Bytes are handed out directly (no shared temp file), so concurrent callers
+    for the same month never race on a path.
     """
     df = _get_monthly_df(trades, month, year)
     if df.empty:
         return None
         
+    key = (year, month, _month_signature(df))
+    cached = _PDF_CACHE.get(key)
+    if cached is not None:
+        return cached
+        
     pdf = PDFReport()
     pdf.add_page()
     pdf.set_font("Arial", size=12)
@@ -111,21 +190,11 @@ def generate_pdf_report(trades: List[Dict], month: int, year: int) -> str:
     df = df.sort_values("exit_date")
     cum_pnl = df["pnl_rupiah"].cumsum()
     
-    plt.figure(figsize=(6, 3))
-    plt.plot(df["exit_date"], cum_pnl, marker='o', linestyle='-')
-    plt.title("Cumulative PnL (Month)")
-    plt.xlabel("Date")
-    plt.ylabel("PnL (Rp)")
-    plt.grid(True)
-    plt.tight_layout()
-    
     with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_img:
-        plt.savefig(tmp_img.name)
+        _render_pnl_chart(df["exit_date"].to_numpy(), cum_pnl.to_numpy(), tmp_img.name)
         pdf.image(tmp_img.name, x=10, w=190)
         chart_path = tmp_img.name
     
-    plt.close()
-    
     pdf.ln(5)
     
     # Strategy Breakdown
@@ -133,7 +202,7 @@ def generate_pdf_report(trades: List[Dict], month: int, year: int) -> str:
     pdf.cell(0, 10, "Strategy Performance", 0, 1)
     pdf.set_font("Times", size=10) # Fixed width somewhat better, or use create_table
     
-    strat_stats = analyze_by_strategy(df.to_dict("records"))
+    strat_stats = analyze_by_strategy(df)
     if not strat_stats.empty:
         # Simple table rendering line by line
         # Header
@@ -142,8 +211,8 @@ def generate_pdf_report(trades: List[Dict], month: int, year: int) -> str:
         pdf.cell(0, 5, header, 0, 1)
         pdf.line(10, pdf.get_y(), 200, pdf.get_y())
         
-        for _, row in strat_stats.iterrows():
-            line = " | ".join([str(val) for val in row.values])
+        for row in strat_stats.itertuples(index=False, name=None):
+            line = " | ".join([str(val) for val in row])
             pdf.cell(0, 5, line, 0, 1)
     else:
         pdf.cell(0, 5, "No strategy data available.", 0, 1)
@@ -157,6 +226,10 @@ def generate_pdf_report(trades: List[Dict], month: int, year: int) -> str:
     
     # Top 10 by PnL
     top_trades = df.sort_values("pnl_rupiah", ascending=False).head(10)
+    top_trades = top_trades.assign(
+        strategy=top_trades["strategy"].fillna("-") if "strategy" in top_trades.columns else "-"
+    )
+    log_cols = ["exit_date", "symbol", "strategy", "pnl_rupiah", "pnl_percent"]
     
     pdf.cell(25, 5, "Date", 1)
     pdf.cell(25, 5, "Symbol", 1)
@@ -165,27 +238,24 @@ def generate_pdf_report(trades: List[Dict], month: int, year: int) -> str:
     pdf.cell(20, 5, "PnL %", 1)
     pdf.ln()
     
-    for _, t in top_trades.iterrows():
-        pnl_str = f"{t['pnl_rupiah']:,.0f}"
-        pct_str = f"{t['pnl_percent']:.1f}%"
-        date_str = t["exit_date"].strftime('%Y-%m-%d')
+    for exit_date, symbol, strategy, pnl_rupiah, pnl_percent in top_trades[log_cols].itertuples(index=False, name=None):
+        pnl_str = f"{pnl_rupiah:,.0f}"
+        pct_str = f"{pnl_percent:.1f}%"
+        date_str = exit_date.strftime('%Y-%m-%d')
         
         pdf.cell(25, 5, date_str, 1)
-        pdf.cell(25, 5, t["symbol"], 1)
-        pdf.cell(20, 5, t.get("strategy", "-"), 1)
+        pdf.cell(25, 5, symbol, 1)
+        pdf.cell(20, 5, strategy, 1)
         pdf.cell(30, 5, pnl_str, 1)
         pdf.cell(20, 5, pct_str, 1)
         pdf.ln()
         
-    filename = f"report_{year}_{month}.pdf"
-    output_path = f"/tmp/{filename}" # In production use proper temp dir or artifact storage
-    # Windows doesn't have /tmp usually, use tempfile dir
-    
-    output_path = os.path.join(tempfile.gettempdir(), filename)
-    pdf.output(output_path)
+    # Render to memory once and keep the bytes
+    pdf_bytes = bytes(pdf.output())
+    _cache_put(_PDF_CACHE, key, pdf_bytes)
     
     # Cleanup image
     if os.path.exists(chart_path):
         os.remove(chart_path)
         
-    return output_path
+    return pdf_bytes
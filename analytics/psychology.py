@@ -1,22 +1,17 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 import pandas as pd
-from .breakdown import _calculate_metrics
+from ._frame import to_frame
+from .breakdown import _aggregate_metrics
 
-def analyze_emotions(trades: List[Dict]) -> pd.DataFrame:
+def analyze_emotions(trades: Union[List[Dict], pd.DataFrame]) -> pd.DataFrame:
     """
     Analyze performance by emotion tags.
     Returns: DataFrame with emotion, win_rate, avg_pnl.
     """
-    if not trades: return pd.DataFrame()
-    df = pd.DataFrame(trades)
+    df = to_frame(trades)
+    if df.empty: return pd.DataFrame()
     
     # Fill None tags
-    df["emotion_tag"] = df["emotion_tag"].fillna("No Tag")
+    df = df.assign(emotion_tag=df["emotion_tag"].fillna("No Tag"))
     
-    results = []
-    for emotion, group in df.groupby("emotion_tag"):
-        metrics = _calculate_metrics(group)
-        metrics["emotion"] = emotion
-        results.append(metrics)
-        
-    return pd.DataFrame(results).sort_values("win_rate", ascending=False)
+    return _aggregate_metrics(df, "emotion_tag", "emotion").sort_values("win_rate", ascending=False)
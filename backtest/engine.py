@@ -3,9 +3,9 @@ import logging
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Type, Optional
+from typing import List, Dict, Type, Optional, Tuple
 
-from db.schemas import Trade, BacktestRun, BacktestTrade
+from db.schemas import Trade, BacktestRun, TechnicalIndicators
 from db.repositories.price_repo import PriceRepository
 from db.repositories.stock_repo import StockRepository
 from db.repositories.backtest_repo import BacktestRepository
@@ -14,9 +14,59 @@ from strategies.vcp import VCPStrategy
 from strategies.ema_pullback import EMAPullbackStrategy
 from strategies.bandarmologi import BandarmologiStrategy
 from backtest.metrics import calculate_metrics
+from utils.jit import njit
 
 logger = logging.getLogger(__name__)
 
+# Exit reason codes returned by check_exits (0 = position stays open)
+EXIT_REASONS = {1: "SL", 2: "TP", 3: "TIMEOUT"}
+MAX_HOLD_DAYS = 90
+# Float columns copied from each price row besides OHLC (None -> NaN)
+_EXTRA_COLUMNS = ("adjusted_close",) + tuple(TechnicalIndicators.model_fields)
+
+# Parsed price data shared by every run in this process (parameter sweeps).
+# Key: (symbol, history start, latest stored bar date) -> (DataFrame, OHLC, date map);
+# a newly ingested bar changes the key, so stale entries are never served.
+_PRICE_CACHE: Dict[tuple, Tuple[pd.DataFrame, np.ndarray, Dict[int, int]]] = {}
+_PRICE_CACHE_SIZE = 1024
+
+
+def clear_price_cache():
+    """Drop all cached backtest price data."""
+    _PRICE_CACHE.clear()
+
+
+@njit(cache=True)
+def check_exits(bars, sl, tp, held_days, max_hold_days):
+    """Evaluate SL/TP/timeout exits for all open positions on one day.
+
+    Args:
+        bars: (K, 4) float64 array of open/high/low/close, one row per position.
+        sl: (K,) stop-loss prices.
+        tp: (K,) take-profit prices.
+        held_days: (K,) calendar days since entry.
+        max_hold_days: Timeout threshold in days.
+
+    Returns:
+        Tuple of (exit_price, reason_code) arrays. reason_code 0 means no exit.
+    """
+    n = bars.shape[0]
+    exit_price = np.zeros(n, dtype=np.float64)
+    reason = np.zeros(n, dtype=np.int8)
+    for i in range(n):
+        open_ = bars[i, 0]
+        if bars[i, 2] <= sl[i]:
+            # Realistic fill: SL price, or the open if it gapped below SL
+            exit_price[i] = sl[i] if open_ > sl[i] else open_
+            reason[i] = 1
+        elif bars[i, 1] >= tp[i]:
+            exit_price[i] = tp[i] if open_ < tp[i] else open_
+            reason[i] = 2
+        elif held_days[i] > max_hold_days:
+            exit_price[i] = bars[i, 3]
+            reason[i] = 3
+    return exit_price, reason
+
 class BacktestEngine:
     """Event-driven backtesting engine."""
     
@@ -47,37 +97,127 @@ class BacktestEngine:
         
         # State
         self.capital = initial_capital
-        self.positions: List[Dict] = [] # List of open trades
+        self.positions: Dict[int, Dict] = {} # trade id -> open trade
+        self._next_trade_id = 0
         self.closed_trades: List[Dict] = []
         self.price_cache = {} # symbol -> DataFrame
+        self.date_iloc: Dict[str, Dict[int, int]] = {} # symbol -> {date ns: row position}
+        self.ohlc_cache: Dict[str, np.ndarray] = {} # symbol -> (N, 4) open/high/low/close
+        self.trading_days: List[datetime] = [] # dates in range with price data for any symbol
 
     def load_data(self):
         """Pre-load historical data for all active stocks."""
         logger.info("Loading historical data...")
         stocks = self.stock_repo.get_active_stocks()
+        history_start = self.start_date - timedelta(days=365)
         
         for stock in stocks:
-            # Check if we have data in range
-            prices = self.price_repo.get_historical_prices(stock.symbol, limit=2000, start_date=self.start_date - timedelta(days=365))
-            if prices:
-                df = pd.DataFrame([p.model_dump() for p in prices])
-                df['date'] = pd.to_datetime(df['date'])
-                df = df.sort_values('date')
-                df.set_index('date', inplace=True)
+            entry = self._load_symbol(stock.symbol, history_start)
+            if entry:
+                df, ohlc, date_iloc = entry
                 self.price_cache[stock.symbol] = df
+                self.ohlc_cache[stock.symbol] = ohlc
+                self.date_iloc[stock.symbol] = date_iloc
         
+        self.trading_days = self._collect_trading_days()
         logger.info(f"Loaded data for {len(self.price_cache)} stocks.")
 
+    def _load_symbol(self, symbol: str, history_start: datetime) -> Optional[tuple]:
+        """Return (DataFrame, OHLC array, date map) for a symbol, reusing the module cache."""
+        latest = self.price_repo.get_latest_price(symbol)
+        if latest is None:
+            return None
+            
+        key = (symbol, history_start, latest.date)
+        entry = _PRICE_CACHE.get(key)
+        if entry is None:
+            prices = self.price_repo.get_historical_prices(symbol, limit=2000, start_date=history_start)
+            if not prices:
+                return None
+            df, ohlc = self._build_frame(symbol, prices)
+            entry = (df, ohlc, self._date_index(df))
+            
+            if len(_PRICE_CACHE) >= _PRICE_CACHE_SIZE:
+                _PRICE_CACHE.pop(next(iter(_PRICE_CACHE))) # evict oldest
+            _PRICE_CACHE[key] = entry
+        return entry
+
+    @staticmethod
+    def _build_frame(symbol: str, prices: List) -> tuple:
+        """Build a date-sorted price DataFrame column by column.
+
+        Fills typed NumPy columns straight from the price rows instead of
+        going through ``model_dump()`` dicts and pandas dtype inference.
+
+        Returns:
+            Tuple of (DataFrame indexed by date, C-contiguous (N, 4) OHLC array).
+        """
+        n = len(prices)
+        ohlc = np.empty((n, 4), dtype=np.float64)
+        volume = np.empty(n, dtype=np.int64)
+        extra = {col: np.empty(n, dtype=np.float64) for col in _EXTRA_COLUMNS}
+        
+        for i, p in enumerate(prices):
+            ohlc[i, 0] = p.open
+            ohlc[i, 1] = p.high
+            ohlc[i, 2] = p.low
+            ohlc[i, 3] = p.close
+            volume[i] = p.volume
+            for col, arr in extra.items():
+                arr[i] = getattr(p, col) # None becomes NaN
+        
+        index = pd.DatetimeIndex([p.date for p in prices], name='date')
+        if not index.is_monotonic_increasing:
+            order = np.argsort(index.asi8, kind='stable')
+            index = index[order]
+            ohlc = ohlc[order]
+            volume = volume[order]
+            extra = {col: arr[order] for col, arr in extra.items()}
+        
+        df = pd.DataFrame({
+            'symbol': symbol,
+            'open': ohlc[:, 0],
+            'high': ohlc[:, 1],
+            'low': ohlc[:, 2],
+            'close': ohlc[:, 3],
+            'volume': volume,
+            **extra,
+        }, index=index)
+        return df, ohlc
+
+    @staticmethod
+    def _date_index(df: pd.DataFrame) -> Dict[int, int]:
+        """Date -> row position lookup for a price frame.
+
+        Keys are nanosecond UTC timestamps so the simulation loop can do a
+        single dict lookup per symbol instead of ``DatetimeIndex.get_loc``.
+        """
+        return {ts: i for i, ts in enumerate(df.index.as_unit('ns').asi8)}
+
+    def _collect_trading_days(self) -> List[datetime]:
+        """Sorted union of loaded price dates within [start_date, end_date]."""
+        if not self.price_cache:
+            return []
+        keys = np.unique(np.concatenate([
+            df.index.as_unit('ns').asi8 for df in self.price_cache.values()
+        ]))
+        lo = pd.Timestamp(self.start_date).value
+        hi = pd.Timestamp(self.end_date).value
+        days = pd.to_datetime(keys[(keys >= lo) & (keys <= hi)], utc=True)
+        
+        # Match the tz-awareness of the requested range so date math stays valid
+        if self.start_date.tzinfo is None:
+            days = days.tz_localize(None)
+        return list(days.to_pydatetime())
+
     def run(self) -> str:
         """Execute the backtest."""
         start_time = datetime.now()
         self.load_data()
         
-        current_date = self.start_date
-        while current_date <= self.end_date:
-            # Skip weekends logic if needed, but data check handles it
+        # Only days with price data; weekends/holidays have nothing to process
+        for current_date in self.trading_days:
             self._process_day(current_date)
-            current_date += timedelta(days=1)
             
         # Close all remaining positions at end date
         self._close_all_positions(self.end_date)
@@ -100,69 +240,39 @@ class BacktestEngine:
         
         run_id = self.backtest_repo.create_run(run)
         
-        # Save Trades
-        db_trades = []
-        for t in self.closed_trades:
-            bt_trade = BacktestTrade(
-                run_id=run_id,
-                strategy=self.strategy_name,
-                symbol=t['symbol'],
-                entry_date=t['entry_date'],
-                entry_price=t['entry_price'],
-                exit_date=t['exit_date'],
-                exit_price=t['exit_price'],
-                qty=t['qty'],
-                pnl_rupiah=t['pnl_rupiah'],
-                pnl_percent=t['pnl_percent'],
-                hold_days=t['hold_days'],
-                exit_reason=t['exit_reason']
-            )
-            db_trades.append(bt_trade)
-            
-        self.backtest_repo.save_trades(db_trades)
+        # Save Trades (raw dicts, bulk insert)
+        self.backtest_repo.bulk_save(run_id, self.strategy_name, self.closed_trades)
         logger.info(f"Backtest completed. Run ID: {run_id}")
         return run_id
 
     def _process_day(self, date: datetime):
         """Simulate one trading day."""
         # 1. Manage Open Positions (Check SL/TP)
-        # We iterate a copy to allow removal
-        for trade in self.positions[:]:
+        # Gather today's bar for every position that traded, then evaluate
+        # all exits in one kernel call
+        date_key = pd.Timestamp(date).value
+        active = []
+        rows = []
+        for trade in self.positions.values():
             symbol = trade['symbol']
-            df = self.price_cache.get(symbol)
+            loc = self.date_iloc.get(symbol, {}).get(date_key)
             
             # If no data for this date, skip
-            if df is None or date not in df.index:
+            if loc is None:
                 continue
-                
-            daily_data = df.loc[date]
-            low = daily_data['low']
-            high = daily_data['high']
-            close = daily_data['close']
-            
-            # Check Exit Conditions
-            exit_price = None
-            exit_reason = None
+            active.append(trade)
+            rows.append(loc)
             
-            # SL Hit
-            if low <= trade['sl_price']:
-                exit_price = min(daily_data['open'], trade['sl_price']) # Gap down protection? Assumes Fill at worst/SL
-                # Optimistic SL: trade['sl_price']. Pessimistic: low. Realistic: max(open, sl) if gap down
-                exit_price = trade['sl_price'] if daily_data['open'] > trade['sl_price'] else daily_data['open']
-                exit_reason = "SL"
-                
-            # TP Hit
-            elif high >= trade['tp_price']:
-                exit_price = trade['tp_price'] if daily_data['open'] < trade['tp_price'] else daily_data['open']
-                exit_reason = "TP"
-                
-            # Time Exit (90 days)
-            elif (date - trade['entry_date']).days > 90:
-                exit_price = close
-                exit_reason = "TIMEOUT"
+        if active:
+            bars = np.array([self.ohlc_cache[t['symbol']][loc] for t, loc in zip(active, rows)])
+            sl = np.array([t['sl_price'] for t in active], dtype=np.float64)
+            tp = np.array([t['tp_price'] for t in active], dtype=np.float64)
+            held = np.array([(date - t['entry_date']).days for t in active], dtype=np.int64)
             
-            if exit_price:
-                self._close_position(trade, exit_price, date, exit_reason)
+            exit_prices, reasons = check_exits(bars, sl, tp, held, MAX_HOLD_DAYS)
+            for trade, exit_price, code in zip(active, exit_prices, reasons):
+                if code:
+                    self._close_position(trade, float(exit_price), date, EXIT_REASONS[int(code)])
 
         # 2. Look for New Signals
         self._scan_for_signals(date)
@@ -174,16 +284,15 @@ class BacktestEngine:
         # For accurate portfolio simulation, we need to track available cash.
         # Let's deduct cost from capital on entry, add back on exit.
         
+        date_key = pd.Timestamp(date).value
         for symbol, df in self.price_cache.items():
-            if date not in df.index:
-                continue
-                
             # Slice data up to THIS date (inclusive)
             # Strategy needs historical context (e.g. 200 days)
-            # data_slice = df.loc[:date] # This is slow if done repeatedly?
-            # Optimization: pass index location
-            
-            idx_loc = df.index.get_loc(date)
+            # Row position comes from the precomputed date map (no get_loc)
+            idx_loc = self.date_iloc[symbol].get(date_key)
+            if idx_loc is None:
+                continue
+                
             if idx_loc < 200: # Insufficient history
                 continue
                 
@@ -212,21 +321,21 @@ class BacktestEngine:
         if risk_per_share <= 0:
             return
 
-        qty = int(risk_amount / risk_per_share)
-        cost = qty * signal.entry_price
-        
-        # Check if enough cash (assuming 20% max allocation per stock for diversification)
-        if cost > self.capital * 0.2: 
-            qty = int((self.capital * 0.2) / signal.entry_price)
-            cost = qty * signal.entry_price
-            
-        if cost > self.capital: # Check absolute cash
-            qty = int(self.capital / signal.entry_price)
-        
+        # Largest size allowed by risk, 20% max allocation per stock, and absolute cash
+        qty = min(
+            int(risk_amount / risk_per_share),
+            int(self.capital * 0.2 / signal.entry_price),
+            int(self.capital / signal.entry_price),
+        )
         if qty <= 0:
             return
+        cost = qty * signal.entry_price
 
+        trade_id = self._next_trade_id
+        self._next_trade_id += 1
+        
         trade = {
+            "id": trade_id,
             "symbol": signal.symbol,
             "entry_date": date,
             "entry_price": signal.entry_price,
@@ -236,7 +345,7 @@ class BacktestEngine:
             "cost": cost
         }
         
-        self.positions.append(trade)
+        self.positions[trade_id] = trade
         self.capital -= cost # Deduct cash
 
     def _close_position(self, trade, exit_price, date, reason):
@@ -256,20 +365,19 @@ class BacktestEngine:
         }
         
         self.closed_trades.append(closed_trade)
-        self.positions.remove(trade)
+        del self.positions[trade['id']]
         self.capital += revenue # Add cash back
 
     def _close_all_positions(self, date):
         """Force close at end of backtest."""
-        for trade in self.positions[:]:
+        for trade in list(self.positions.values()):
             symbol = trade['symbol']
             df = self.price_cache.get(symbol)
             
             close_price = trade['entry_price'] # Fallback
-            if df is not None and date in df.index:
-                close_price = df.loc[date]['close']
-            elif df is not None:
-                # Use last available price
-                close_price = df.iloc[-1]['close']
+            if df is not None:
+                # Close on the given date if traded, else last available price
+                loc = self.date_iloc[symbol].get(pd.Timestamp(date).value, -1)
+                close_price = self.ohlc_cache[symbol][loc, 3]
                 
             self._close_position(trade, close_price, date, "END_OF_BACKTEST")
@@ -60,14 +60,14 @@ def calculate_metrics(trades: List[Dict[str, Any]], initial_capital: float) -> D
     df['exit_date'] = pd.to_datetime(df['exit_date'])
     df = df.sort_values('exit_date')
     
-    equity = [initial_capital]
-    current_capital = initial_capital
-    
-    for pnl in df['pnl_rupiah']:
-        current_capital += pnl
-        equity.append(current_capital)
-        
-    equity_curve = np.array(equity)
+    # Prefix-sum of PnL on top of initial capital (index 0 = starting capital)
+    pnl_arr = df['pnl_rupiah'].to_numpy(dtype=np.float64)
+    equity_curve = np.empty(len(pnl_arr) + 1, dtype=np.float64)
+    equity_curve[0] = initial_capital
+    np.cumsum(pnl_arr, out=equity_curve[1:])
+    equity_curve[1:] += initial_capital
+    current_capital = float(equity_curve[-1])
+
     peaks = np.maximum.accumulate(equity_curve)
     drawdowns = (equity_curve - peaks) / peaks * 100
     max_drawdown = drawdowns.min()
@@ -79,12 +79,12 @@ def calculate_metrics(trades: List[Dict[str, Any]], initial_capital: float) -> D
     # Sharpe Ratio (Simplified using trade returns, ideally should use daily returns)
     # Annualized assuming 252 trading days average, but here we use per-trade sequence
     # This is a rough approximation if we don't have daily equity snapshots
-    returns = df['pnl_percent'] / 100
-    if len(returns) > 1 and returns.std() > 0:
-        sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(len(returns)) # Annualized? No, this is trade-based Sharpe
-        # Let's stick to standard trade-based Sharpe or Sortino
-        # Ideally: (Mean Return - Risk Free) / Std Dev
-        sharpe_ratio = round(returns.mean() / returns.std(), 2)
+    # Ideally: (Mean Return - Risk Free) / Std Dev, sample std (ddof=1) like pandas
+    pnl_pct = df['pnl_percent'].to_numpy(dtype=np.float64)
+    returns = pnl_pct * 0.01
+    returns_std = returns.std(ddof=1) if returns.size > 1 else 0.0
+    if returns_std > 0:
+        sharpe_ratio = round(float(returns.mean() / returns_std), 2)
     else:
         sharpe_ratio = 0.0
 
@@ -99,6 +99,6 @@ def calculate_metrics(trades: List[Dict[str, Any]], initial_capital: float) -> D
         "risk_reward": risk_reward,
         "total_return": round(total_return_pct, 2),
         "final_capital": round(current_capital, 2),
-        "best_trade": round(df['pnl_percent'].max(), 2),
-        "worst_trade": round(df['pnl_percent'].min(), 2)
+        "best_trade": round(float(pnl_pct.max()), 2),
+        "worst_trade": round(float(pnl_pct.min()), 2)
     }
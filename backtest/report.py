@@ -1,6 +1,66 @@
 """Report generation for backtest results."""
+from collections import ChainMap
+from functools import lru_cache
 from typing import Dict, Any
 
+_HEADER_TMPL = (
+    "📊 *Backtest Report — {strategy}*\n"
+    "Periode: {start} → {end}\n\n"
+)
+
+_NO_TRADES_TMPL = _HEADER_TMPL + (
+    "⚠️ *Tidak ada trade yang dieksekusi.*\n\n"
+    "Kemungkinan penyebab:\n"
+    "• Data historis tidak memadai di database\n"
+    "• Kriteria sinyal strategi terlalu ketat\n"
+    "• Untuk *bandarmologi*: data broker/foreign tidak tersedia di mode backtest\n"
+    "  (hanya price-action yang digunakan)"
+)
+
+_REPORT_TMPL = _HEADER_TMPL + (
+    "*📈 Performance:*\n"
+    "• Return: `{total_return:.2f}%`\n"
+    "• Win Rate: `{win_rate:.1f}%`\n"
+    "• Total Trade: `{total_trades}`\n"
+    "• Profit Factor: `{profit_factor}`\n"
+    "• Max Drawdown: `{max_drawdown:.2f}%`\n"
+    "• Sharpe Ratio: `{sharpe_ratio}`\n\n"
+    "*📉 Rata-rata Trade:*\n"
+    "• Avg Profit: `{avg_profit:.2f}%`\n"
+    "• Avg Loss: `{avg_loss:.2f}%`\n"
+    "• Best Trade: `{best_trade:.2f}%`\n"
+    "• Worst Trade: `{worst_trade:.2f}%`\n"
+    "• R/R: `1:{risk_reward}`\n\n"
+    "*💰 Modal:*\n"
+    "• Awal: `Rp {initial_capital:,.0f}`\n"
+    "• Akhir: `Rp {final_capital:,.0f}`"
+)
+
+# Fallbacks for metrics missing from the run
+_METRIC_DEFAULTS = {
+    "total_return": 0,
+    "win_rate": 0,
+    "total_trades": 0,
+    "profit_factor": 0,
+    "max_drawdown": 0,
+    "sharpe_ratio": 0,
+    "avg_profit": 0,
+    "avg_loss": 0,
+    "best_trade": 0,
+    "worst_trade": 0,
+    "risk_reward": 0,
+}
+
+
+@lru_cache(maxsize=1024)
+def _fmt_date(d) -> str:
+    """Safe date formatting (handles datetime object, string or None)."""
+    if d is None:
+        return "N/A"
+    if hasattr(d, "strftime"):
+        return d.strftime("%Y-%m-%d")
+    return str(d)[:10]
+
 
 def generate_backtest_report(run, metrics: Dict[str, Any]) -> str:
     """Generate a text summary of the backtest.
@@ -22,50 +82,22 @@ def generate_backtest_report(run, metrics: Dict[str, Any]) -> str:
         end_date = run.get("end_date")
         initial_capital = run.get("initial_capital", 0)
 
-    # Safe date formatting (handles datetime object or None)
-    def fmt_date(d):
-        if d is None:
-            return "N/A"
-        if hasattr(d, "strftime"):
-            return d.strftime("%Y-%m-%d")
-        return str(d)[:10]
-
-    total_trades = metrics.get("total_trades", 0)
+    ctx = ChainMap(
+        {
+            "strategy": strategy.upper(),
+            "start": _fmt_date(start_date),
+            "end": _fmt_date(end_date),
+            "initial_capital": initial_capital,
+        },
+        metrics,
+        {"final_capital": initial_capital},
+        _METRIC_DEFAULTS,
+    )
 
-    if total_trades == 0:
-        summary = (
-            f"📊 *Backtest Report — {strategy.upper()}*\n"
-            f"Periode: {fmt_date(start_date)} → {fmt_date(end_date)}\n\n"
-            f"⚠️ *Tidak ada trade yang dieksekusi.*\n\n"
-            f"Kemungkinan penyebab:\n"
-            f"• Data historis tidak memadai di database\n"
-            f"• Kriteria sinyal strategi terlalu ketat\n"
-            f"• Untuk *bandarmologi*: data broker/foreign tidak tersedia di mode backtest\n"
-            f"  (hanya price-action yang digunakan)"
-        )
-        return summary
+    if ctx["total_trades"] == 0:
+        return _NO_TRADES_TMPL.format_map(ctx)
 
-    summary = (
-        f"📊 *Backtest Report — {strategy.upper()}*\n"
-        f"Periode: {fmt_date(start_date)} → {fmt_date(end_date)}\n\n"
-        f"*📈 Performance:*\n"
-        f"• Return: `{metrics.get('total_return', 0):.2f}%`\n"
-        f"• Win Rate: `{metrics.get('win_rate', 0):.1f}%`\n"
-        f"• Total Trade: `{total_trades}`\n"
-        f"• Profit Factor: `{metrics.get('profit_factor', 0)}`\n"
-        f"• Max Drawdown: `{metrics.get('max_drawdown', 0):.2f}%`\n"
-        f"• Sharpe Ratio: `{metrics.get('sharpe_ratio', 0)}`\n\n"
-        f"*📉 Rata-rata Trade:*\n"
-        f"• Avg Profit: `{metrics.get('avg_profit', 0):.2f}%`\n"
-        f"• Avg Loss: `{metrics.get('avg_loss', 0):.2f}%`\n"
-        f"• Best Trade: `{metrics.get('best_trade', 0):.2f}%`\n"
-        f"• Worst Trade: `{metrics.get('worst_trade', 0):.2f}%`\n"
-        f"• R/R: `1:{metrics.get('risk_reward', 0)}`\n\n"
-        f"*💰 Modal:*\n"
-        f"• Awal: `Rp {initial_capital:,.0f}`\n"
-        f"• Akhir: `Rp {metrics.get('final_capital', initial_capital):,.0f}`"
-    )
-    return summary.strip()
+    return _REPORT_TMPL.format_map(ctx).strip()
 
 
 def format_telegram_message(run_id: str, summary: str) -> str:
@@ -1,17 +1,70 @@
 """Handler for /analyze command."""
+import time
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 from telegram import Update
 from telegram.ext import ContextTypes
 from loguru import logger
 
+from db.schemas import TechnicalIndicators
 from db.repositories.price_repo import PriceRepository
 from db.repositories.stock_repo import StockRepository
 from strategies.vcp import VCPStrategy
 from strategies.ema_pullback import EMAPullbackStrategy
 from engine.signal_generator import SignalGenerator
+from bot.utils import get_repo, normalize_symbol
 from data.pipeline import DataPipeline  # Optional: logic to fetch latest data if not present?
 # For now, we rely on existing data in DB.
 
+# Raw price field -> TitleCase column expected by the strategies
+_OHLC_COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close"}
+_INDICATOR_COLUMNS = ("adjusted_close",) + tuple(TechnicalIndicators.model_fields)
+
+# Strategies and the repo-less generator keep no per-call state; build them once
+_VCP = VCPStrategy()
+_EMA = EMAPullbackStrategy()
+_ENGINE = SignalGenerator()
+
+
+def _prices_to_frame(docs: list) -> pd.DataFrame:
+    """Build the strategy input DataFrame column-wise from raw price dicts (oldest first)."""
+    n = len(docs)
+    columns = {"date": pd.to_datetime([d["date"] for d in docs])}
+    for field, name in _OHLC_COLUMNS.items():
+        columns[name] = np.fromiter((d[field] for d in docs), dtype=np.float64, count=n)
+    columns["Volume"] = np.fromiter((d["volume"] for d in docs), dtype=np.int64, count=n)
+    for field in _INDICATOR_COLUMNS:
+        # Indicators may be missing/None on older rows
+        columns[field] = np.fromiter(
+            (np.nan if d.get(field) is None else d[field] for d in docs), dtype=np.float64, count=n
+        )
+    return pd.DataFrame(columns)
+
+
+# IHSG is shared by every /analyze call and only changes once a day
+_IHSG_SYMBOL = "^JKSE"
+_IHSG_TTL = 3600.0
+_IHSG_CACHE: Dict[date, Tuple[float, Optional[pd.DataFrame]]] = {}
+
+
+def _get_ihsg_df(price_repo: PriceRepository) -> Optional[pd.DataFrame]:
+    """IHSG frame for RS calc, cached per trading date (read-only for strategies)."""
+    key = datetime.now().date()
+    now = time.monotonic()
+    hit = _IHSG_CACHE.get(key)
+    if hit and now - hit[0] < _IHSG_TTL:
+        return hit[1]
+        
+    ihsg_prices = price_repo.get_historical_prices_raw(_IHSG_SYMBOL, limit=250)
+    ihsg_df = _prices_to_frame(ihsg_prices) if ihsg_prices else None
+    # Only today's entry is ever useful
+    _IHSG_CACHE.clear()
+    _IHSG_CACHE[key] = (now, ihsg_df)
+    return ihsg_df
+
 
 async def handle_analyze_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Analyze a single stock on demand."""
@@ -19,16 +72,13 @@ async def handle_analyze_command(update: Update, context: ContextTypes.DEFAULT_T
         await update.message.reply_text("Usage: `/analyze <TICKER>`\nContoh: `/analyze BBCA`", parse_mode="Markdown")
         return
 
-    symbol = context.args[0].upper()
-    if not symbol.endswith(".JK"):
-        symbol += ".JK"
+    symbol = normalize_symbol(context.args[0])
     
     msg = await update.message.reply_text(f"🔍 Analyzing {symbol}...")
     
     try:
-        db = context.bot_data["db"]
-        price_repo = PriceRepository(db)
-        stock_repo = StockRepository(db)
+        price_repo = get_repo(context, PriceRepository)
+        stock_repo = get_repo(context, StockRepository)
         
         # Check if stock exists
         stock = stock_repo.get_stock(symbol)
@@ -37,53 +87,33 @@ async def handle_analyze_command(update: Update, context: ContextTypes.DEFAULT_T
             return
 
         # Get Data (last 250 days)
-        prices = price_repo.get_historical_prices(symbol, limit=250)
+        prices = price_repo.get_historical_prices_raw(symbol, limit=250)
         if len(prices) < 200:
             await msg.edit_text(f"❌ Insufficient data for {symbol} ({len(prices)}/200 days).")
             return
             
-        # Convert to DataFrame
-        # DailyPriceInDB model -> dict -> DataFrame
-        df = pd.DataFrame([p.model_dump() for p in prices])
-        # Standardize column names to TitleCase for strategies
-        df = df.rename(columns={
-            "open": "Open", 
-            "high": "High", 
-            "low": "Low", 
-            "close": "Close", 
-            "volume": "Volume"
-        })
-        # Sort ascending by date for analysis
-        df = df.sort_values("date", ascending=True).reset_index(drop=True)
+        # Raw docs (ascending by date) -> TitleCase DataFrame for strategies
+        df = _prices_to_frame(prices)
         
         # Get IHSG Data for RS calc (simplified: get IHSG or skip RS if logic complex)
         # Ideally we fetch IHSG from DB. Assuming 'COMPOSITE.JK' or 'IHSG' is in DB?
         # Sprint 2 Plan says "IHSG data ... gap-fill ...".
         # For now, let's try to get ^JKSE or similar if available, or pass None.
-        ihsg_prices = price_repo.get_historical_prices("^JKSE", limit=250) # Assuming symbol for IHSG
-        ihsg_df = None
-        if ihsg_prices:
-             ihsg_df = pd.DataFrame([p.model_dump() for p in ihsg_prices]).sort_values("date").reset_index(drop=True)
-             ihsg_df = ihsg_df.rename(columns={
-                "open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"
-             })
+        ihsg_df = _get_ihsg_df(price_repo)
         
         # Run Strategies
-        vcp = VCPStrategy()
-        ema = EMAPullbackStrategy()
-        
-        vcp_sig = vcp.analyze(df, symbol=symbol)
-        ema_sig = ema.analyze(df, symbol=symbol, ihsg_data=ihsg_df)
+        vcp_sig = _VCP.analyze(df, symbol=symbol)
+        ema_sig = _EMA.analyze(df, symbol=symbol, ihsg_data=ihsg_df)
         
         # Run Engine
-        engine = SignalGenerator()
-        final_sig = engine.generate(symbol, [vcp_sig, ema_sig])
+        final_sig = _ENGINE.generate(symbol, [vcp_sig, ema_sig])
         
         # Format Output
-        last_price = df.iloc[-1]["Close"]
+        close_arr = df["Close"].to_numpy()
+        last_price = float(close_arr[-1])
         change_pct = 0.0
-        if len(df) > 1:
-            prev_close = df.iloc[-2]["Close"]
+        if close_arr.size > 1:
+            prev_close = close_arr[-2]
             change_pct = ((last_price - prev_close) / prev_close) * 100
         
         icon = "🟢" if final_sig.verdict == "BUY" else "⚪"
@@ -6,8 +6,9 @@ from loguru import logger
 from db.connection import get_database
 from backtest.engine import BacktestEngine
 from backtest.report import generate_backtest_report, format_telegram_message
+from bot.utils import reply_md
 
-VALID_STRATEGIES = {"vcp", "ema_pullback", "bandarmologi"}
+VALID_STRATEGIES: frozenset[str] = frozenset({"vcp", "ema_pullback", "bandarmologi"})
 
 
 async def backtest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -18,7 +19,8 @@ async def backtest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     args = context.args
     if not args:
-        await update.message.reply_text(
+        await reply_md(
+            update,
             "📊 *Backtest Usage:*\n"
             "`/backtest <strategy> [days=365]`\n\n"
             "*Strategies:*\n"
@@ -27,16 +29,15 @@ async def backtest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "• `bandarmologi` — Bandarmologi\n\n"
             "_⚠️ Bandarmologi backtest menggunakan price-action only "
             "(data broker/foreign tidak tersedia di historical)_",
-            parse_mode="Markdown",
         )
         return
 
-    strategy = args[0].lower()
+    strategy = args[0].casefold()
     if strategy not in VALID_STRATEGIES:
-        await update.message.reply_text(
+        await reply_md(
+            update,
             f"❌ Strategi `{strategy}` tidak dikenal.\n"
             f"Pilihan: `vcp`, `ema_pullback`, `bandarmologi`",
-            parse_mode="Markdown",
         )
         return
 
@@ -45,22 +46,19 @@ async def backtest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if args[1].isdigit():
             days = int(args[1])
         else:
-            await update.message.reply_text(
-                f"❌ `days` harus berupa angka, contoh: `/backtest {strategy} 180`",
-                parse_mode="Markdown",
+            await reply_md(
+                update, f"❌ `days` harus berupa angka, contoh: `/backtest {strategy} 180`"
             )
             return
 
     if days < 30 or days > 1825:
-        await update.message.reply_text(
-            "❌ `days` harus antara 30 s/d 1825 (5 tahun).", parse_mode="Markdown"
-        )
+        await reply_md(update, "❌ `days` harus antara 30 s/d 1825 (5 tahun).")
         return
 
-    status_msg = await update.message.reply_text(
+    status_msg = await reply_md(
+        update,
         f"⏳ Menjalankan backtest *{strategy.upper()}* selama *{days} hari*...\n\n"
         f"_Proses ini mungkin memakan waktu 1-3 menit._",
-        parse_mode="Markdown",
     )
 
     try:
@@ -1,9 +1,17 @@
 from telegram import Update
 from telegram.ext import ContextTypes
-import pandas as pd
+import numpy as np
 from db.repositories.broker_repo import BrokerRepository
 from db.repositories.foreign_flow_repo import ForeignFlowRepository
 from strategies.bandarmologi import BandarmologiStrategy
+from bot.utils import get_repo, normalize_symbol
+
+# Columns the detectors read; payloads are ~10 rows so plain arrays beat a DataFrame
+BROKER_COLS = ("date", "broker_code", "net_value")
+FLOW_COLS = ("date", "foreign_net")
+
+# Detection methods only read their thresholds; one shared instance is enough
+_BANDAR = BandarmologiStrategy()
 
 async def handle_bandar_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /bandar <SYMBOL> command."""
@@ -11,18 +19,15 @@ async def handle_bandar_command(update: Update, context: ContextTypes.DEFAULT_TY
         await update.message.reply_text("❌ Usage: `/bandar <SYMBOL>` (e.g. `/bandar BBCA`)")
         return
         
-    symbol = context.args[0].upper()
-    if not symbol.endswith(".JK"):
-        symbol += ".JK"
+    symbol = normalize_symbol(context.args[0])
         
-    db = context.bot_data["db"]
-    broker_repo = BrokerRepository(db)
-    flow_repo = ForeignFlowRepository(db)
+    broker_repo = get_repo(context, BrokerRepository)
+    flow_repo = get_repo(context, ForeignFlowRepository)
     
     # Fetch Data
     # Get last 10 days for analysis
     # Note: Repos normally return list of objects.
-    # Convert to DataFrame for Strategy
+    # Converted to column arrays for the strategy below
     
     broker_summary = broker_repo.get_latest(symbol, limit=10)
     flow_summary = flow_repo.get_history(symbol, limit=10)
@@ -31,21 +36,15 @@ async def handle_bandar_command(update: Update, context: ContextTypes.DEFAULT_TY
         await update.message.reply_text(f"❌ No bandarmologi data found for {symbol}.")
         return
         
-    # Convert to DataFrame
-    broker_dicts = [b.model_dump() for b in broker_summary]
-    flow_dicts = [f.model_dump() for f in flow_summary]
-    
-    broker_df = pd.DataFrame(broker_dicts) if broker_dicts else pd.DataFrame()
-    flow_df = pd.DataFrame(flow_dicts) if flow_dicts else pd.DataFrame()
-    
-    # Initialize Strategy for detection methods
-    strategy = BandarmologiStrategy()
+    # Column arrays for the detectors
+    broker_data = {col: np.array([getattr(b, col) for b in broker_summary]) for col in BROKER_COLS}
+    flow_data = {col: np.array([getattr(f, col) for f in flow_summary]) for col in FLOW_COLS}
     
     msg = f"🕵️ **Bandarmologi Analysis: {symbol}**\n\n"
     
     # Accumulation Analysis
-    if not broker_df.empty:
-        accum = strategy.detect_accumulation(broker_df)
+    if broker_summary:
+        accum = _BANDAR.detect_accumulation(broker_data)
         status = "✅ Accumulation" if accum["is_accumulating"] else "neutral"
         msg += f"**Broker Summary**: {status}\n"
         if accum["is_accumulating"]:
@@ -57,8 +56,8 @@ async def handle_bandar_command(update: Update, context: ContextTypes.DEFAULT_TY
     msg += "\n"
     
     # Foreign Flow Analysis
-    if not flow_df.empty:
-        foreign = strategy.detect_foreign_flow(flow_df)
+    if flow_summary:
+        foreign = _BANDAR.detect_foreign_flow(flow_data)
         status = "✅ Net Buy" if foreign["is_foreign_buying"] else "neutral" # Or Net Sell check
         net_val = foreign['net_7d']
         
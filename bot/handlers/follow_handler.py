@@ -9,6 +9,7 @@ from db.repositories.portfolio_repo import PortfolioRepository
 from db.repositories.trade_repo import TradeRepository
 from journal.trade_manager import TradeManager
 from db.schemas import Trade
+from bot.utils import get_config_cached, get_repo, normalize_symbol, reply_md
 
 async def handle_follow_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -16,17 +17,14 @@ async def handle_follow_command(update: Update, context: ContextTypes.DEFAULT_TY
     Creates a draft trade based on the latest signal.
     """
     if not context.args:
-        await update.message.reply_text("Usage: `/follow <SYMBOL>`", parse_mode="Markdown")
+        await reply_md(update, "Usage: `/follow <SYMBOL>`")
         return
 
-    symbol = context.args[0].upper()
-    if not symbol.endswith(".JK"):
-        symbol += ".JK"
+    symbol = normalize_symbol(context.args[0])
 
-    db = context.bot_data["db"]
-    signal_repo = SignalRepository(db)
-    portfolio_repo = PortfolioRepository(db)
-    trade_repo = TradeRepository(db)
+    signal_repo = get_repo(context, SignalRepository)
+    portfolio_repo = get_repo(context, PortfolioRepository)
+    trade_repo = get_repo(context, TradeRepository)
     # trade manager for creation? or use repo directly for draft? 
     # Manager.create_trade sets status='open' by default in my implementation.
     # I should use repo directly for draft or add draft support to manager. 
@@ -34,16 +32,16 @@ async def handle_follow_command(update: Update, context: ContextTypes.DEFAULT_TY
     # Actually I can just create Trade model with status='draft' and insert.
     
     # 1. Get Signal
-    signals = signal_repo.get_signal_by_symbol(symbol, limit=1)
-    if not signals:
+    signal = signal_repo.get_latest_signal(symbol)
+    if signal is None:
         await update.message.reply_text(f"❌ No signals found for {symbol}.")
         return
         
-    signal = signals[0]
     # Check strict freshness? (Today only?)
     # Sprint requirement doesn't specify strictness, but implies "Follow Signal".
     # Let's warn if old.
-    now_date = datetime.now().date()
+    now = datetime.now()
+    now_date = now.date()
     sig_date = signal.date.date()
     
     is_stale = sig_date < now_date
@@ -54,24 +52,25 @@ async def handle_follow_command(update: Update, context: ContextTypes.DEFAULT_TY
         return
 
     # 2. Get Portfolio Config
-    config = portfolio_repo.get_config("nesa")
+    config = get_config_cached(portfolio_repo, "nesa")
     if not config:
         await update.message.reply_text("❌ Portfolio not configured. setup `/capital` first.")
         return
 
     # 3. Calculate Position Size
-    # Risk Amount = Capital * Risk%
-    risk_amount = config.total_capital * config.risk_per_trade
-    
+    # Risk Amount = Capital * Risk%, sized in integer cents to avoid float edge cases
     entry = signal.entry_price
     sl = signal.sl_price
-    risk_per_share = abs(entry - sl)
+    risk_cents = int(round(config.total_capital * config.risk_per_trade * 100))
+    rps_cents = int(round(abs(entry - sl) * 100))
     
-    if risk_per_share == 0:
+    if rps_cents == 0:
         await update.message.reply_text("❌ Invalid Signal: Entry == SL.")
         return
         
-    qty_shares = int(risk_amount / risk_per_share)
+    risk_amount = risk_cents / 100
+    risk_per_share = rps_cents / 100
+    qty_shares = risk_cents // rps_cents
     # Round to lot (100 shares)
     qty_lots = qty_shares // 100
     qty_final = qty_lots * 100
@@ -96,7 +95,7 @@ async def handle_follow_command(update: Update, context: ContextTypes.DEFAULT_TY
     draft_trade = Trade(
         user="nesa",
         symbol=symbol,
-        entry_date=datetime.now(), # Draft created now
+        entry_date=now, # Draft created now
         qty=qty_final,
         qty_remaining=qty_final,
         entry_price=entry,
@@ -107,14 +106,8 @@ async def handle_follow_command(update: Update, context: ContextTypes.DEFAULT_TY
         signal_ref=str(signal.symbol) # Ideally ObjectId, but schema is str.
     )
     
-    # Check if draft already exists?
-    existing = trade_repo.get_draft_trades(symbol)
-    if existing:
-        # Update existing draft? Or just delete old and insert new.
-        # Simplest: Insert new.
-        pass
-        
-    trade_id = trade_repo.insert_trade(draft_trade)
+    # Replaces any earlier draft for this symbol instead of stacking duplicates
+    trade_id = trade_repo.upsert_draft(draft_trade)
     
     # 5. response
     msg = (
@@ -130,7 +123,7 @@ async def handle_follow_command(update: Update, context: ContextTypes.DEFAULT_TY
         f"To confirm & open, type:\n`/confirm {symbol}`"
     )
     
-    await update.message.reply_text(msg, parse_mode="Markdown")
+    await reply_md(update, msg)
 
 
 async def handle_confirm_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -142,12 +135,9 @@ async def handle_confirm_command(update: Update, context: ContextTypes.DEFAULT_T
         await update.message.reply_text("Usage: `/confirm <SYMBOL>`")
         return
 
-    symbol = context.args[0].upper()
-    if not symbol.endswith(".JK"):
-        symbol += ".JK"
+    symbol = normalize_symbol(context.args[0])
 
-    db = context.bot_data["db"]
-    trade_repo = TradeRepository(db)
+    trade_repo = get_repo(context, TradeRepository)
     
     drafts = trade_repo.get_draft_trades(symbol)
     if not drafts:
@@ -161,10 +151,11 @@ async def handle_confirm_command(update: Update, context: ContextTypes.DEFAULT_T
     # Use TradeManager logic? Or direct update?
     # Direct update is fine here since we just change status
     
+    now = datetime.now()
     fields = {
         "status": "open",
-        "entry_date": datetime.now(), # meaningful entry time
-        "updated_at": datetime.now()
+        "entry_date": now, # meaningful entry time
+        "updated_at": now
     }
     
     # Need to handle _id from repository (draft is Trade object).
@@ -5,6 +5,24 @@ from telegram.ext import ContextTypes
 from monitoring.health_check import check_all
 from bot.utils import is_admin
 
+_STATUS_ICON = {"ok": "✅", "warning": "⚠️", "error": "❌"}
+
+_HEALTH_TMPL = (
+    "<b>System Health Report</b>\n"
+    "Timestamp: {ts}\n\n"
+    
+    "<b>Database</b>\n"
+    "{mongo_icon} MongoDB ({mongo_ms}ms)\n\n"
+    
+    "<b>External API</b>\n"
+    "{api_icon} Yahoo Finance ({api_ms}ms)\n\n"
+    
+    "<b>Data Pipeline</b>\n"
+    "{pipeline_icon} Last Run: {last_run}\n"
+    "Age: {hours_since}h\n"
+    "Success Rate: {success_rate}\n"
+)
+
 @is_admin
 async def health_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /health command."""
@@ -13,32 +31,20 @@ async def health_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     try:
         results = check_all()
         
-        # Format message
-        mongo_status = "✅" if results["mongodb"]["status"] == "ok" else "❌"
-        api_status = "✅" if results["external_api"]["status"] == "ok" else "❌"
-        
+        mongo_res = results["mongodb"]
+        api_res = results["external_api"]
         pipeline_res = results["pipeline"]
-        pipeline_icon = "✅"
-        if pipeline_res["status"] == "warning":
-            pipeline_icon = "⚠️"
-        elif pipeline_res["status"] == "error":
-            pipeline_icon = "❌"
-            
-        message = (
-            f"<b>System Health Report</b>\n"
-            f"Timestamp: {results['timestamp']}\n\n"
-            
-            f"<b>Database</b>\n"
-            f"{mongo_status} MongoDB ({results['mongodb'].get('latency_ms', 0)}ms)\n\n"
-            
-            f"<b>External API</b>\n"
-            f"{api_status} Yahoo Finance ({results['external_api'].get('latency_ms', 0)}ms)\n\n"
-            
-            f"<b>Data Pipeline</b>\n"
-            f"{pipeline_icon} Last Run: {pipeline_res.get('last_run', 'N/A')}\n"
-            f"Age: {pipeline_res.get('hours_since', 'N/A')}h\n"
-            f"Success Rate: {pipeline_res.get('success_rate', 'N/A')}\n"
-        )
+        message = _HEALTH_TMPL.format_map({
+            "ts": results["timestamp"],
+            "mongo_icon": _STATUS_ICON.get(mongo_res["status"], "❓"),
+            "mongo_ms": mongo_res.get("latency_ms", 0),
+            "api_icon": _STATUS_ICON.get(api_res["status"], "❓"),
+            "api_ms": api_res.get("latency_ms", 0),
+            "pipeline_icon": _STATUS_ICON.get(pipeline_res["status"], "❓"),
+            "last_run": pipeline_res.get("last_run", "N/A"),
+            "hours_since": pipeline_res.get("hours_since", "N/A"),
+            "success_rate": pipeline_res.get("success_rate", "N/A"),
+        })
         
         await status_msg.edit_text(message, parse_mode="HTML")
         
@@ -5,7 +5,12 @@ from telegram.ext import ContextTypes
 from loguru import logger
 
 from db.repositories.portfolio_repo import PortfolioRepository
-from risk.heat_monitor import calculate_portfolio_heat
+from risk.heat_monitor import HEAT_PROJECTION, calculate_portfolio_heat
+from bot.utils import get_config_cached, get_repo, reply_md
+
+# Precomputed heat bars, indexed by number of filled cells
+_BAR_LEN = 20
+_BARS = tuple("█" * i + "░" * (_BAR_LEN - i) for i in range(_BAR_LEN + 1))
 
 async def handle_heat_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
@@ -16,15 +21,17 @@ async def handle_heat_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
 
     db = context.bot_data["db"]
-    repo = PortfolioRepository(db)
+    repo = get_repo(context, PortfolioRepository)
     
-    config = repo.get_config()
+    config = get_config_cached(repo)
     if not config:
         await update.message.reply_text("⚠️ Configuration not found.")
         return
 
-    # Fetch open trades
-    open_trades_cursor = db.trades.find({"status": "open", "user": config.user})
+    # Fetch open trades (projected, single batch)
+    open_trades_cursor = db.trades.find(
+        {"status": "open", "user": config.user}, projection=HEAT_PROJECTION
+    ).batch_size(200)
     open_trades = list(open_trades_cursor)
     
     # Calculate heat
@@ -45,10 +52,8 @@ async def handle_heat_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     
     current = heat_status["current_heat"]
     limit = heat_status["max_heat"]
-    pct = min(current / limit, 1.0) if limit > 0 else 0
-    bar_len = 20
-    filled = int(pct * bar_len)
-    bar = "█" * filled + "░" * (bar_len - filled)
+    pct = min(max(current / limit, 0.0), 1.0) if limit > 0 else 0
+    bar = _BARS[int(pct * _BAR_LEN)]
     
     status_emoji = "🟢 Safe"
     if heat_status["status"] == "limit":
@@ -56,24 +61,21 @@ async def handle_heat_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     elif heat_status["status"] == "warning":
         status_emoji = "🟡 WARNING"
         
-    msg = (
-        f"🔥 *Portfolio Heat Monitor*\n"
-        f"──────────────────\n"
-        f"Current Heat: {current:.1%} / {limit:.1%}\n"
-        f"`{bar}` {status_emoji}\n\n"
-        f"Open Positions ({len(open_trades)}):\n"
-    )
+    parts = [
+        "🔥 *Portfolio Heat Monitor*\n",
+        "──────────────────\n",
+        f"Current Heat: {current:.1%} / {limit:.1%}\n",
+        f"`{bar}` {status_emoji}\n\n",
+        f"Open Positions ({len(open_trades)}):\n",
+    ]
     
     for pos in heat_status["positions"]:
-        sym = pos["symbol"]
-        r = pos["risk"]
-        exp_rupiah = pos["exposure"]
-        exp_pct = exp_rupiah / config.total_capital if config.total_capital else 0
-        msg += f"  `{sym:<8} | R: {r:.1%} | E: {exp_pct:.1%}`\n"
-        
-    msg += f"\nAvailable Heat: {heat_status['available_heat']:.1%}\n"
+        exp_pct = pos["exposure"] / config.total_capital if config.total_capital else 0
+        parts.append(f"  `{pos['symbol']:<8} | R: {pos['risk']:.1%} | E: {exp_pct:.1%}`\n")
     
     cash_ok = "✅" if heat_status["cash_reserve_ok"] else "⚠️"
-    msg += f"Cash Reserve: {heat_status['cash_reserve_pct']:.1%} (target: {config.cash_reserve_target:.1%}) {cash_ok}"
+    parts.append(f"\nAvailable Heat: {heat_status['available_heat']:.1%}\n")
+    parts.append(f"Cash Reserve: {heat_status['cash_reserve_pct']:.1%} (target: {config.cash_reserve_target:.1%}) {cash_ok}")
+    msg = "".join(parts)
     
-    await update.message.reply_text(msg, parse_mode="Markdown")
+    await reply_md(update, msg)
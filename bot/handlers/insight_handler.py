@@ -5,11 +5,14 @@ from db.repositories.trade_repo import TradeRepository
 from analytics.monthly_report import generate_monthly_report
 from analytics.bias_detector import detect_biases
 from analytics.adaptive_scorer import calculate_strategy_scores
+from bot.utils import get_repo
+
+# (minimum score, emoji), highest band first
+_SCORE_BANDS = ((70, "🟢"), (50, "🟡"))
 
 async def handle_report_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /report command. Usage: /report [MM] [YYYY]"""
-    db = context.bot_data["db"]
-    repo = TradeRepository(db)
+    repo = get_repo(context, TradeRepository)
     
     # Defaults
     now = datetime.now()
@@ -27,9 +30,7 @@ async def handle_report_command(update: Update, context: ContextTypes.DEFAULT_TY
             await update.message.reply_text("❌ Invalid format. Use: `/report [MM] [YYYY]`")
             return
 
-    trades = repo.get_all_closed_trades()
-    # Convert to dicts
-    trade_dicts = [t.model_dump() for t in trades]
+    trade_dicts = repo.get_closed_trade_dicts()
     
     report_md = generate_monthly_report(trade_dicts, month, year)
     
@@ -38,39 +39,34 @@ async def handle_report_command(update: Update, context: ContextTypes.DEFAULT_TY
 
 async def handle_bias_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /bias command to check for trading errors."""
-    db = context.bot_data["db"]
-    repo = TradeRepository(db)
+    repo = get_repo(context, TradeRepository)
     
-    trades = repo.get_all_closed_trades()
-    trade_dicts = [t.model_dump() for t in trades]
+    columns = repo.get_closed_trade_columns()
     
-    biases = detect_biases(trade_dicts)
+    biases = detect_biases(columns)
     
     if not biases:
         await update.message.reply_text("✅ No significant behavioral biases detected.", parse_mode="Markdown")
     else:
-        msg = "⚠️ **Behavioral Biases Detected:**\n\n"
-        for b in biases:
-            msg += f"- {b}\n"
-        await update.message.reply_text(msg, parse_mode="Markdown")
+        parts = ["⚠️ **Behavioral Biases Detected:**", ""]
+        parts.extend(f"- {b}" for b in biases)
+        await update.message.reply_text("\n".join(parts), parse_mode="Markdown")
 
 async def handle_scores_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /scores command to view adaptive strategy scores."""
-    db = context.bot_data["db"]
-    repo = TradeRepository(db)
+    repo = get_repo(context, TradeRepository)
     
-    trades = repo.get_all_closed_trades()
-    trade_dicts = [t.model_dump() for t in trades]
+    columns = repo.get_closed_trade_columns()
     
-    scores = calculate_strategy_scores(trade_dicts)
+    scores = calculate_strategy_scores(columns)
     
     if not scores:
         await update.message.reply_text("ℹ️ Not enough data to calculate strategy scores.")
         return
         
-    msg = "📊 **Adaptive Strategy Scores**\n\n"
+    parts = ["📊 **Adaptive Strategy Scores**", ""]
     for strategy, score in scores.items():
-        emoji = "🟢" if score >= 70 else "🟡" if score >= 50 else "🔴"
-        msg += f"{emoji} **{strategy}**: {score}\n"
+        emoji = next((e for floor, e in _SCORE_BANDS if score >= floor), "🔴")
+        parts.append(f"{emoji} **{strategy}**: {score}")
         
-    await update.message.reply_text(msg, parse_mode="Markdown")
+    await update.message.reply_text("\n".join(parts), parse_mode="Markdown")
@@ -6,14 +6,18 @@ from loguru import logger
 from db.repositories.trade_repo import TradeRepository
 from journal.statistics import StatisticsEngine
 from journal.exporter import Exporter
+from bot.utils import get_repo, md_escape, normalize_symbol
+
+_STATUS_ICONS = {"open": "🟢", "closed": "🔴"}
+_ROW_TPL = "{icon} *{symbol}* ({date})\n   {qty:,} @ {entry:,.0f} {pnl}"
+_ROW_TEMPLATES = {"closed": _ROW_TPL + "\n   Exit: {exit:,.0f} | Hold: {hold}d"}
 
 async def handle_journal_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     /journal [page]
     List recent trades (open and closed).
     """
-    db = context.bot_data["db"]
-    repo = TradeRepository(db)
+    repo = get_repo(context, TradeRepository)
     
     # Simple pagination?
     limit = 5
@@ -23,22 +27,27 @@ async def handle_journal_command(update: Update, context: ContextTypes.DEFAULT_T
         await update.message.reply_text("📭 Journal is empty.")
         return
         
-    msg = "📔 *Trading Journal (Last 5)*\n\n"
+    parts = ["📔 *Trading Journal (Last 5)*", ""]
     for t in trades:
-        status_icon = "🟢" if t.status == "open" else "🔴" if t.status == "closed" else "📝"
         pnl_str = ""
         if t.pnl_rupiah is not None:
             icon = "✅" if t.pnl_rupiah > 0 else "❌"
             pnl_str = f"| {icon} {t.pnl_rupiah:,.0f}"
             
-        date_str = t.entry_date.strftime("%d/%m")
-        msg += f"{status_icon} *{t.symbol}* ({date_str})\n"
-        msg += f"   {t.qty:,} @ {t.entry_price:,.0f} {pnl_str}\n"
-        if t.status == "closed":
-             msg += f"   Exit: {t.exit_price:,.0f} | Hold: {t.holding_days}d\n"
-        msg += "\n"
+        # Closed trades get the extra Exit/Hold line via their own template
+        parts.append(_ROW_TEMPLATES.get(t.status, _ROW_TPL).format_map({
+            "icon": _STATUS_ICONS.get(t.status, "📝"),
+            "symbol": md_escape(t.symbol),
+            "date": t.entry_date.strftime("%d/%m"),
+            "qty": t.qty,
+            "entry": t.entry_price,
+            "pnl": pnl_str,
+            "exit": t.exit_price,
+            "hold": t.holding_days,
+        }))
+        parts.append("")
         
-    await update.message.reply_text(msg, parse_mode="Markdown")
+    await update.message.reply_text("\n".join(parts), parse_mode="Markdown")
 
 
 async def handle_stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -46,12 +55,10 @@ async def handle_stats_command(update: Update, context: ContextTypes.DEFAULT_TYP
     /stats
     Show performance summary.
     """
-    db = context.bot_data["db"]
-    repo = TradeRepository(db)
+    repo = get_repo(context, TradeRepository)
     
-    # Get all closed trades (implied by pnl presence, or check status)
-    all_trades = repo.get_all_trades()
-    closed_trades = [t for t in all_trades if t.status == "closed" or (t.legs and t.pnl_rupiah)]
+    # Closed trades, plus open ones with realized PnL from partial exits
+    closed_trades = repo.get_trades_for_stats()
     
     stats = StatisticsEngine.calculate_summary(closed_trades)
     
@@ -77,44 +84,40 @@ async def handle_trade_detail_command(update: Update, context: ContextTypes.DEFA
          await update.message.reply_text("Usage: `/trade <SYMBOL>`")
          return
          
-    symbol = context.args[0].upper()
-    if not symbol.endswith(".JK"):
-        symbol += ".JK"
+    symbol = normalize_symbol(context.args[0])
         
-    db = context.bot_data["db"]
-    repo = TradeRepository(db)
+    repo = get_repo(context, TradeRepository)
     
-    trades = repo.get_last_trades(limit=5) # Not filtered by symbol in repo method?
-    # We need filter. `get_open_trades` filters. `get_last_trades` doesn't support symbol arg currently.
-    # Let's use `get_open_trades` + `get_closed_trades`?
-    # Or just fetch all and filter python side (inefficient but ok for now)
-    # Better: Add method to repo or valid query.
-    # Checking repo content... `get_open_trades` supports symbol.
-    # Let's just find open ones first.
-    
-    open_trades = repo.get_open_trades(symbol)
-    if open_trades:
-        t = open_trades[0]
+    t = repo.get_latest_trade_by_symbol(symbol)
+    if t is None:
+        await update.message.reply_text(f"❌ No open or closed trade found for {symbol}.")
+        return
+        
+    if t.status == "open":
         # Detail View
         msg = (
-            f"🟢 *Open Trade: {t.symbol}*\n"
+            f"🟢 *Open Trade: {md_escape(t.symbol)}*\n"
             f"Entry: {t.entry_date.strftime('%Y-%m-%d')} @ {t.entry_price:,.0f}\n"
             f"Qty: {t.qty:,}\n"
-            f"Strategy: {t.strategy}\n"
-            f"Notes: {t.notes or '-'}\n"
+            f"Strategy: {md_escape(t.strategy)}\n"
+            f"Notes: {md_escape(t.notes or '-')}\n"
         )
         if t.legs:
-            msg += "\n*Partial Exits:*\n"
-            for leg in t.legs:
-                msg += f"- {leg.qty} @ {leg.exit_price:,.0f} ({leg.pnl_rupiah:,.0f})\n"
-                
-        await update.message.reply_text(msg, parse_mode="Markdown")
-        return
-
-    # If no open, find closed?
-    # We don't have explicit `get_closed_trades_by_symbol` in repo yet.
-    # Use generic query or skip.
-    await update.message.reply_text(f"❌ No active open trade found for {symbol}.")
+            legs = [f"- {leg.qty} @ {leg.exit_price:,.0f} ({leg.pnl_rupiah:,.0f})" for leg in t.legs]
+            msg += "\n*Partial Exits:*\n" + "\n".join(legs) + "\n"
+    else:
+        exit_date = t.exit_date.strftime('%Y-%m-%d') if t.exit_date else "-"
+        msg = (
+            f"⚪ *Closed Trade: {md_escape(t.symbol)}*\n"
+            f"Entry: {t.entry_date.strftime('%Y-%m-%d')} @ {t.entry_price:,.0f}\n"
+            f"Exit: {exit_date} @ {t.exit_price or 0:,.0f}\n"
+            f"Qty: {t.qty:,}\n"
+            f"P&L: Rp {t.pnl_rupiah or 0:,.0f} ({t.pnl_percent or 0:+.2f}%)\n"
+            f"Strategy: {md_escape(t.strategy)}\n"
+            f"Notes: {md_escape(t.notes or '-')}\n"
+        )
+            
+    await update.message.reply_text(msg, parse_mode="Markdown")
 
 
 async def handle_export_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -122,8 +125,7 @@ async def handle_export_command(update: Update, context: ContextTypes.DEFAULT_TY
     /export
     Send CSV file of all trades.
     """
-    db = context.bot_data["db"]
-    repo = TradeRepository(db)
+    repo = get_repo(context, TradeRepository)
     
     trades = repo.get_all_trades()
     if not trades:
@@ -134,7 +136,7 @@ async def handle_export_command(update: Update, context: ContextTypes.DEFAULT_TY
     
     # Send file
     await update.message.reply_document(
-        document=csv_buffer.getvalue().encode(),
+        document=csv_buffer,
         filename=f"journal_export_{len(trades)}.csv",
         caption=f"📊 Exported {len(trades)} trades."
     )
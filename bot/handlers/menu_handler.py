@@ -48,7 +48,13 @@ _MAIN_KEYBOARD = InlineKeyboardMarkup([
     ],
 ])
 
+# Satu keyboard "Kembali" dipakai bersama oleh semua sub-menu
+_BACK_KEYBOARD = InlineKeyboardMarkup([[
+    InlineKeyboardButton("◀ Kembali", callback_data="menu_back"),
+]])
+
 # ── Sub-menu teks ──────────────────────────────────────────────────────────────
+# Teks sudah di-escape untuk MarkdownV2 sekali di sini; handler mengirimnya apa adanya.
 
 _MENUS: dict[str, tuple[str, InlineKeyboardMarkup]] = {
 
@@ -60,9 +66,7 @@ _MENUS: dict[str, tuple[str, InlineKeyboardMarkup]] = {
         "`/bias` — Market bias IHSG saat ini \\(bullish / bearish / netral\\)\n"
         "`/scores` — Skor adaptif setiap strategi berdasarkan historis\n\n"
         "💡 _Gunakan sinyal sebagai referensi, bukan saran investasi\\._",
-        InlineKeyboardMarkup([[
-            InlineKeyboardButton("◀ Kembali", callback_data="menu_back"),
-        ]]),
+        _BACK_KEYBOARD,
     ),
 
     "menu_watchlist": (
@@ -72,9 +76,7 @@ _MENUS: dict[str, tuple[str, InlineKeyboardMarkup]] = {
         "`/remove BBCA\\.JK` — Hapus saham dari watchlist\n"
         "`/follow BBCA\\.JK` — Follow sinyal otomatis untuk saham tertentu\n\n"
         "📎 _Format ticker: KODE\\.JK \\(contoh: BBCA\\.JK, BUMI\\.JK\\)_",
-        InlineKeyboardMarkup([[
-            InlineKeyboardButton("◀ Kembali", callback_data="menu_back"),
-        ]]),
+        _BACK_KEYBOARD,
     ),
 
     "menu_journal": (
@@ -86,9 +88,7 @@ _MENUS: dict[str, tuple[str, InlineKeyboardMarkup]] = {
         "✏️ *Entry \\& Exit Trade:*\n"
         "Gunakan `/addtrade` untuk membuka posisi baru \\(ikuti panduan interaktif\\)\n"
         "Gunakan `/closetrade` untuk menutup posisi \\(ikuti panduan interaktif\\)",
-        InlineKeyboardMarkup([[
-            InlineKeyboardButton("◀ Kembali", callback_data="menu_back"),
-        ]]),
+        _BACK_KEYBOARD,
     ),
 
     "menu_risk": (
@@ -99,9 +99,7 @@ _MENUS: dict[str, tuple[str, InlineKeyboardMarkup]] = {
         "🔢 *Rumus Sizing:*\n"
         "Lot \\= \\(Modal × Risk%\\) ÷ \\(Entry \\- SL\\) ÷ 100\n\n"
         "⚡ _Circuit breaker otomatis aktif jika heat melebihi batas\\._",
-        InlineKeyboardMarkup([[
-            InlineKeyboardButton("◀ Kembali", callback_data="menu_back"),
-        ]]),
+        _BACK_KEYBOARD,
     ),
 
     "menu_portfolio": (
@@ -111,9 +109,7 @@ _MENUS: dict[str, tuple[str, InlineKeyboardMarkup]] = {
         "`/confirm` — Konfirmasi follow sinyal yang pending\n"
         "`/health` — Status sistem bot \\(DB, scheduler, versi\\)\n\n"
         "💰 _Contoh: `/capital 50000000` = Rp 50 juta_",
-        InlineKeyboardMarkup([[
-            InlineKeyboardButton("◀ Kembali", callback_data="menu_back"),
-        ]]),
+        _BACK_KEYBOARD,
     ),
 
     "menu_research": (
@@ -122,9 +118,7 @@ _MENUS: dict[str, tuple[str, InlineKeyboardMarkup]] = {
         "`/report` — Laporan performa strategi periode ini\n"
         "`/scores` — Ranking strategi berdasarkan win rate adaptif\n\n"
         "⏱ _Backtest menggunakan data 2 tahun terakhir\\._",
-        InlineKeyboardMarkup([[
-            InlineKeyboardButton("◀ Kembali", callback_data="menu_back"),
-        ]]),
+        _BACK_KEYBOARD,
     ),
 
     "menu_all": (
@@ -144,13 +138,18 @@ _MENUS: dict[str, tuple[str, InlineKeyboardMarkup]] = {
         "`/backtest` `/report`\n\n"
         "ℹ️ *BANTUAN*\n"
         "`/menu` `/start`",
-        InlineKeyboardMarkup([[
-            InlineKeyboardButton("◀ Kembali", callback_data="menu_back"),
-        ]]),
+        _BACK_KEYBOARD,
     ),
 }
 
 
+# Callback data → (teks, keyboard); "menu_back" kembali ke menu utama
+_DISPATCH: dict[str, tuple[str, InlineKeyboardMarkup]] = {
+    **_MENUS,
+    "menu_back": (_WELCOME, _MAIN_KEYBOARD),
+}
+
+
 # ── Handler functions ─────────────────────────────────────────────────────────
 
 async def handle_start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -176,27 +175,17 @@ async def handle_menu_callback(update: Update, context: ContextTypes.DEFAULT_TYP
     query = update.callback_query
     await query.answer()  # hapus loading indicator
 
-    data = query.data
-
-    if data == "menu_back":
-        # Kembali ke menu utama
-        await query.edit_message_text(
-            _WELCOME,
-            parse_mode="MarkdownV2",
-            reply_markup=_MAIN_KEYBOARD,
-        )
+    entry = _DISPATCH.get(query.data)
+    if entry is None:
+        logger.warning(f"Unknown menu callback: {query.data}")
         return
 
-    if data in _MENUS:
-        text, keyboard = _MENUS[data]
-        await query.edit_message_text(
-            text,
-            parse_mode="MarkdownV2",
-            reply_markup=keyboard,
-        )
-        return
-
-    logger.warning(f"Unknown menu callback: {data}")
+    text, keyboard = entry
+    await query.edit_message_text(
+        text,
+        parse_mode="MarkdownV2",
+        reply_markup=keyboard,
+    )
 
 
 # ── CallbackQueryHandler yang bisa langsung di-register ───────────────────────
@@ -5,17 +5,20 @@ from loguru import logger
 
 from db.repositories.portfolio_repo import PortfolioRepository
 from db.schemas import PortfolioConfig
+from bot.utils import get_config_cached, get_repo, invalidate_config_cache
+
+# Drop thousands separators from the typed amount in one pass
+_NUM_STRIP = str.maketrans("", "", ",.")
 
 
 async def handle_capital_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /capital command to set or view total capital."""
-    db = context.bot_data["db"]
-    repo = PortfolioRepository(db)
+    repo = get_repo(context, PortfolioRepository)
     user = "nesa" # Single user default
 
     if not context.args:
         # View current capital
-        config = repo.get_config(user)
+        config = get_config_cached(repo, user)
         if config:
             await update.message.reply_text(
                 f"💰 *Current Capital*: Rp {config.total_capital:,.0f}\n"
@@ -27,14 +30,14 @@ async def handle_capital_command(update: Update, context: ContextTypes.DEFAULT_T
         return
 
     try:
-        amount_str = context.args[0].replace(",", "").replace(".", "")
+        amount_str = context.args[0].translate(_NUM_STRIP)
         amount = float(amount_str)
         
         if amount <= 0:
             await update.message.reply_text("❌ Capital must be greater than 0.")
             return
 
-        config = repo.get_config(user)
+        config = get_config_cached(repo, user)
         if config:
             repo.update_capital(user, amount)
         else:
@@ -45,6 +48,7 @@ async def handle_capital_command(update: Update, context: ContextTypes.DEFAULT_T
                 risk_per_trade=0.01  # Default 1%
             )
             repo.upsert_config(new_config)
+        invalidate_config_cache(user)
 
         await update.message.reply_text(f"✅ Capital updated: Rp {amount:,.0f}")
 
@@ -57,12 +61,11 @@ async def handle_capital_command(update: Update, context: ContextTypes.DEFAULT_T
 
 async def handle_risk_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /risk command to set or view risk per trade."""
-    db = context.bot_data["db"]
-    repo = PortfolioRepository(db)
+    repo = get_repo(context, PortfolioRepository)
     user = "nesa"
 
     if not context.args:
-        config = repo.get_config(user)
+        config = get_config_cached(repo, user)
         if config:
             await update.message.reply_text(
                 f"⚠️ *Risk per Trade*: {config.risk_per_trade*100:.1f}%\n"
@@ -84,9 +87,10 @@ async def handle_risk_command(update: Update, context: ContextTypes.DEFAULT_TYPE
             
         risk_decimal = risk_pct / 100.0
         
-        config = repo.get_config(user)
+        config = get_config_cached(repo, user)
         if config:
             repo.update_risk(user, risk_decimal)
+            invalidate_config_cache(user)
             await update.message.reply_text(f"✅ Risk per trade updated: {risk_pct}%")
         else:
             await update.message.reply_text("❌ Set `/capital` first before setting risk.")
@@ -1,11 +1,11 @@
 from telegram import Update
 from telegram.ext import ContextTypes
 from datetime import datetime
-import os
+import asyncio
 
-from db.connection import get_database
 from db.repositories.trade_repo import TradeRepository
-from analytics.monthly_report import generate_pdf_report, generate_markdown_report
+from analytics.monthly_report import generate_pdf_report, generate_markdown_report, pdf_report_filename
+from bot.utils import get_repo
 
 async def report_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
@@ -37,37 +37,36 @@ async def report_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     status_msg = await update.message.reply_text(f"📊 Generating report for {month}/{year}...")
     
     try:
-        db = get_database()
-        repo = TradeRepository(db)
-        trades_objs = repo.get_all_closed_trades()
-        trades = [t.model_dump() for t in trades_objs]
+        repo = get_repo(context, TradeRepository)
+        # pymongo and the report builders are synchronous; keep them off the event loop
+        trades = await asyncio.to_thread(repo.get_closed_trade_dicts)
         
         # Markdown Summary
-        md_report = generate_markdown_report(trades, month, year)
+        md_report = await asyncio.to_thread(generate_markdown_report, trades, month, year)
         
         # Check if empty (string starts with "No trades")
         if md_report.startswith("No trades"):
             await status_msg.edit_text(f"❌ {md_report}")
             return
             
-        # Send Markdown
-        await status_msg.edit_text(md_report, parse_mode="Markdown")
-        
-        # Generate PDF
-        pdf_path = generate_pdf_report(trades, month, year)
-        
-        if pdf_path and os.path.exists(pdf_path):
+        # Send Markdown while the PDF renders; the two are independent
+        edit_result, pdf_bytes = await asyncio.gather(
+            status_msg.edit_text(md_report, parse_mode="Markdown"),
+            asyncio.to_thread(generate_pdf_report, trades, month, year),
+            return_exceptions=True,
+        )
+        if isinstance(edit_result, BaseException):
+            raise edit_result
+        if isinstance(pdf_bytes, BaseException):
+            raise pdf_bytes
+
+        if pdf_bytes:
+            # Sent straight from memory: no shared temp file for concurrent reports to race on
             await update.message.reply_document(
-                document=open(pdf_path, 'rb'),
-                filename=os.path.basename(pdf_path),
+                document=pdf_bytes,
+                filename=pdf_report_filename(month, year),
                 caption=f"📄 Detailed Report {month}/{year}"
             )
-            # Cleanup
-            # os.remove(pdf_path) # Maybe keep for a bit or rely on temp cleaner? 
-            # Safe to remove after verify?
-            # Telegram might need file open during send? 
-            # create task to remove later? or just leave in temp.
-            pass
             
     except Exception as e:
         await status_msg.edit_text(f"❌ Error generating report: {e}")
@@ -1,12 +1,27 @@
 """Handler for /size command (FR-08)."""
 
+import asyncio
+
 from telegram import Update
 from telegram.ext import ContextTypes
 from loguru import logger
 
 from db.repositories.portfolio_repo import PortfolioRepository
+from risk.heat_monitor import HEAT_PROJECTION, calculate_portfolio_heat, project_heat_with_new_trade
 from risk.position_sizer import calculate_position_size
-from risk.sector_mapper import get_sector_info
+from risk.sector_mapper import get_sector_info_cached
+from bot.utils import get_config_cached, get_repo
+
+_SIZE_TEMPLATE = (
+    "📐 *Position Sizing: {symbol}*\n"
+    "──────────────────\n"
+    "Entry: Rp {entry:,.0f} | SL: Rp {sl:,.0f}\n"
+    "Distance: Rp {sl_distance:,.0f} ({sl_distance_pct:.1%})\n"
+    "Risk Amount: Rp {risk_amount:,.0f} ({risk_pct:.1%})\n"
+    "Shares: {shares:,} ({lots:,} lot)\n"
+    "Exposure: Rp {exposure_rupiah:,.0f} ({exposure_pct:.1%}) {exposure_check}\n"
+    "Heat: {current_heat:.1%} → {projected_heat:.1%} {heat_arrow}\n"
+)
 
 async def handle_size_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
@@ -45,19 +60,25 @@ async def handle_size_command(update: Update, context: ContextTypes.DEFAULT_TYPE
             return
 
     db = context.bot_data["db"]
-    repo = PortfolioRepository(db)
+    repo = get_repo(context, PortfolioRepository)
+    
+    user = "nesa"  # single user mode, same default as PortfolioConfig.user
     
-    # Fetch config
-    config = repo.get_config()
+    # Config, sector info (small cap check) and open trades (current heat) are
+    # independent; pymongo/yfinance are synchronous, so run them in threads concurrently
+    config, (sector, market_cap), open_trades = await asyncio.gather(
+        asyncio.to_thread(get_config_cached, repo, user),
+        asyncio.to_thread(get_sector_info_cached, symbol),
+        asyncio.to_thread(
+            lambda: list(db.trades.find({"status": "open", "user": user}, projection=HEAT_PROJECTION))
+        ),
+    )
     if not config:
         await update.message.reply_text("⚠️ Configuration not found. Use `/capital` to set up first.")
         return
 
     capital = config.total_capital
     risk_pct = risk_override if risk_override is not None else config.risk_per_trade
-
-    # Get sector info for small cap check
-    sector, market_cap = await get_sector_info(symbol)
     is_small_cap = (market_cap == "small")
 
     # Calculate
@@ -96,18 +117,9 @@ async def handle_size_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     # Let's check imports. We need to import TradeRepository? Or generic DB?
     # context.bot_data["db"] is database object.
     
-    # Fetch open trades
+    # Open trades were fetched above alongside the config.
     # Using raw query for speed/simplicity as we don't have trade repo imported yet.
-    # Or good practice: import repo.
-    
-    # Wait, I don't want to overcomplicate imports if repo not standard.
-    # DB access is fine.
-
-    open_trades_cursor = db.trades.find({"status": "open", "user": config.user})
-    open_trades = list(open_trades_cursor)
 
-    from risk.heat_monitor import calculate_portfolio_heat, project_heat_with_new_trade
-    
     heat_status = calculate_portfolio_heat(open_trades, capital, config.max_heat)
     current_heat = heat_status["current_heat"]
     
@@ -118,11 +130,16 @@ async def handle_size_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     
     proj_heat = project_heat_with_new_trade(current_heat, actual_risk_pct, config.max_heat)
     
+    # Trade would be rejected anyway: answer in one line instead of the full breakdown
+    if proj_heat["would_exceed"]:
+        await update.message.reply_text(
+            f"🔴 Heat limit exceeded ({proj_heat['projected_heat']:.1%} > {config.max_heat:.1%})"
+        )
+        return
+    
     # Formatting
     heat_arrow = "🟢"
-    if proj_heat["would_exceed"]:
-        heat_arrow = "🔴 LIMIT"
-    elif proj_heat["projected_heat"] >= 0.06: # Warning threshold hardcoded or from config?
+    if proj_heat["projected_heat"] >= 0.06: # Warning threshold hardcoded or from config?
         heat_arrow = "🟡 WARNING"
         
     exposure_check = "✅"
@@ -135,16 +152,17 @@ async def handle_size_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     # If warnings exist, show them
     risk_warnings = "\n".join([f"⚠️ {w}" for w in result["warnings"]])
     
-    msg = (
-        f"📐 *Position Sizing: {symbol}*\n"
-        f"──────────────────\n"
-        f"Entry: Rp {entry:,.0f} | SL: Rp {sl:,.0f}\n"
-        f"Distance: Rp {result['sl_distance']:,.0f} ({result['sl_distance_pct']:.1%})\n"
-        f"Risk Amount: Rp {result['risk_amount']:,.0f} ({risk_pct:.1%})\n"
-        f"Shares: {result['shares']:,} ({result['lots']:,} lot)\n"
-        f"Exposure: Rp {result['exposure_rupiah']:,.0f} ({result['exposure_pct']:.1%}) {exposure_check}\n"
-        f"Heat: {current_heat:.1%} → {proj_heat['projected_heat']:.1%} {heat_arrow}\n"
-    )
+    msg = _SIZE_TEMPLATE.format_map({
+        **result,
+        "symbol": symbol,
+        "entry": entry,
+        "sl": sl,
+        "risk_pct": risk_pct,
+        "exposure_check": exposure_check,
+        "current_heat": current_heat,
+        "projected_heat": proj_heat["projected_heat"],
+        "heat_arrow": heat_arrow,
+    })
     
     if risk_warnings:
         msg += f"\n{risk_warnings}"
@@ -12,6 +12,39 @@ from loguru import logger
 
 from db.repositories.trade_repo import TradeRepository
 from journal.trade_manager import TradeManager
+from bot.utils import get_repo, normalize_symbol
+
+# Drop thousands separators ("1.250" / "1,250") from typed numbers in one pass
+_NUM_STRIP = str.maketrans("", "", ",.")
+
+# Reply layouts for the confirm steps, filled from the conversation's user_data dicts
+_CONFIRM_ADD_TPL = (
+    "📝 *Konfirmasi Entry*\n"
+    "Symbol: {symbol}\n"
+    "Date: {entry_date:%Y-%m-%d}\n"
+    "Buy: {qty:,} @ {entry_price:,}\n"
+    "Strategy: {strategy}\n"
+    "Risk: {risk_percent}%\n"
+    "Emotion: {emotion_tag}\n\n"
+    "Ketik 'ok' untuk simpan, atau /cancel untuk batal."
+)
+_CONFIRM_CLOSE_TPL = (
+    "📝 *Confirm Close*\n"
+    "Type: {type}\n"
+    "Sell: {qty:,} @ {exit_price:,}\n"
+    "Date: {exit_date:%Y-%m-%d}\n\n"
+    "Ketik 'ok' untuk proses."
+)
+_CLOSED_TPL = "✅ Trade Updated!\nP&L: {pnl_rupiah:,.0f} ({pnl_percent:.2f}%)\nStatus: {status}"
+
+
+def _parse_date(text: str) -> datetime:
+    """Parse a typed YYYY-MM-DD date (fromisoformat fast path, strptime for e.g. 2024-1-5)."""
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return datetime.strptime(text, "%Y-%m-%d")
+
 
 # States
 (
@@ -47,9 +80,7 @@ async def start_add_trade(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     return SYMBOL
 
 async def add_symbol(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    text = update.message.text.upper()
-    if not text.endswith(".JK"):
-        text += ".JK"
+    text = normalize_symbol(update.message.text)
     
     context.user_data["trade_entry"] = {"symbol": text}
     
@@ -66,7 +97,7 @@ async def add_date(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         if text == "today":
             entry_date = datetime.now()
         else:
-            entry_date = datetime.strptime(text, "%Y-%m-%d")
+            entry_date = _parse_date(text)
             
         context.user_data["trade_entry"]["entry_date"] = entry_date
         
@@ -78,7 +109,7 @@ async def add_date(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 async def add_price(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     try:
-        price = float(update.message.text.replace(",", "").replace(".", ""))
+        price = float(update.message.text.translate(_NUM_STRIP))
         context.user_data["trade_entry"]["entry_price"] = price
         await update.message.reply_text("📊 Quantity (Jumlah Lembar):")
         return QTY
@@ -88,7 +119,7 @@ async def add_price(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 async def add_qty(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     try:
-        qty = int(update.message.text.replace(",", "").replace(".", ""))
+        qty = int(update.message.text.translate(_NUM_STRIP))
         context.user_data["trade_entry"]["qty"] = qty
         
         strategies = [["VCP", "EMA Pullback"], ["Bandarmologi", "Custom"]]
@@ -133,23 +164,12 @@ async def add_notes(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     
     data = context.user_data["trade_entry"]
     
-    summary = (
-        f"📝 *Konfirmasi Entry*\n"
-        f"Symbol: {data['symbol']}\n"
-        f"Date: {data['entry_date'].strftime('%Y-%m-%d')}\n"
-        f"Buy: {data['qty']:,} @ {data['entry_price']:,}\n"
-        f"Strategy: {data['strategy']}\n"
-        f"Risk: {data['risk_percent']}%\n"
-        f"Emotion: {data['emotion_tag']}\n\n"
-        "Ketik 'ok' untuk simpan, atau /cancel untuk batal."
-    )
-    await update.message.reply_text(summary, parse_mode="Markdown")
+    await update.message.reply_text(_CONFIRM_ADD_TPL.format_map(data), parse_mode="Markdown")
     return CONFIRM_ADD
 
 async def confirm_add(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     if update.message.text.lower() == "ok":
-        db = context.bot_data["db"]
-        repo = TradeRepository(db)
+        repo = get_repo(context, TradeRepository)
         manager = TradeManager(repo)
         
         try:
@@ -173,17 +193,13 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 async def start_close_trade(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Start /closetrade [SYMBOL]."""
     if context.args:
-        text = context.args[0].upper()
-        if not text.endswith(".JK"):
-            text += ".JK"
-        symbol = text
+        symbol = normalize_symbol(context.args[0])
     else:
         # Ask for symbol if not provided? simplified: req args
         await update.message.reply_text("Usage: `/closetrade <SYMBOL>`", parse_mode="Markdown")
         return ConversationHandler.END
         
-    db = context.bot_data["db"]
-    repo = TradeRepository(db)
+    repo = get_repo(context, TradeRepository)
     trades = repo.get_open_trades(symbol=symbol)
     
     if not trades:
@@ -245,7 +261,7 @@ async def close_type(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 async def close_qty(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     try:
-        qty = int(update.message.text.replace(",", "").replace(".", ""))
+        qty = int(update.message.text.translate(_NUM_STRIP))
         trade = context.user_data["close_trade"]
         if qty > trade.qty_remaining or qty <= 0:
             await update.message.reply_text(f"❌ Invalid qty. Max: {trade.qty_remaining}")
@@ -259,7 +275,7 @@ async def close_qty(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 async def close_price(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     try:
-        price = float(update.message.text.replace(",", "").replace(".", ""))
+        price = float(update.message.text.translate(_NUM_STRIP))
         context.user_data["close_params"]["exit_price"] = price
         await update.message.reply_text("💸 Fees (Broker + Tax, Rp or 0):")
         return CLOSE_FEES
@@ -268,7 +284,7 @@ async def close_price(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
 
 async def close_fees(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     try:
-        fees = float(update.message.text.replace(",", "").replace(".", ""))
+        fees = float(update.message.text.translate(_NUM_STRIP))
         context.user_data["close_params"]["fees"] = fees
         await update.message.reply_text("📅 Exit Date (YYYY-MM-DD or 'today'):")
         return CLOSE_DATE
@@ -281,7 +297,7 @@ async def close_date(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         if text == "today":
             dt = datetime.now()
         else:
-            dt = datetime.strptime(text, "%Y-%m-%d")
+            dt = _parse_date(text)
         context.user_data["close_params"]["exit_date"] = dt
         
         emotions = [["Confident", "Anxious"], ["Panic", "Disciplined"]]
@@ -300,20 +316,12 @@ async def close_emotion(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     data = context.user_data["close_params"]
     trade = context.user_data["close_trade"]
     
-    await update.message.reply_text(
-        f"📝 *Confirm Close*\n"
-        f"Type: {data['type']}\n"
-        f"Sell: {data['qty']:,} @ {data['exit_price']:,}\n"
-        f"Date: {data['exit_date'].strftime('%Y-%m-%d')}\n\n"
-        "Ketik 'ok' untuk proses.",
-        parse_mode="Markdown"
-    )
+    await update.message.reply_text(_CONFIRM_CLOSE_TPL.format_map(data), parse_mode="Markdown")
     return CONFIRM_CLOSE
 
 async def confirm_close(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     if update.message.text.lower() == "ok":
-        db = context.bot_data["db"]
-        repo = TradeRepository(db)
+        repo = get_repo(context, TradeRepository)
         manager = TradeManager(repo)
         
         trade = context.user_data["close_trade"]
@@ -329,54 +337,38 @@ async def confirm_close(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
         
         try:
             if params["type"] == "Close All":
-                res = manager.close_trade(str(trade.id), exit_payload) # Pydantic model doesn't store _id in field `id` by default unless aliased? 
-                # PyMongo retrieves _id. Pydantic schema doesn't have id field defined? 
-                # Schema: Trade(BaseModel). 
-                # When converting from DB doc to Trade, _id is usually lost unless mapped.
-                # !!! IMPORTANT: Trade schema needs to handle _id or we pass it separately?
-                # TradeRepository.get_open_trades returns List[Trade].
-                # We need the ID to update.
-                # Let's verify Trade schema in previous step.
-                # It doesn't have id field.
-                # We should add id alias or extract from context if possible. 
-                # Repo.get_open_trades -> does it default parse _id? No.
-                # Fix: TradeRepository should attach _id to the object or return tuple.
-                
-                # Assume we need to fix TradeRepository or Schema to include ID.
-                # For now, let's assume I can get ID from the doc directly if stored in user_data as dict?
-                # But I stored `Trade` object.
-                # I will fix TradeRepository to inject id or use dicts?
-                # Better: Allow TradeRepository to return dicts or TradeWithID.
-                
-                # TEMPORARY FIX: Assume Trade object has no ID. I need to re-fetch/match? 
-                # Or simply: In `get_open_trades`, mapping _id to id str. Needs schema update.
-                pass
+                # Trade.id is the stringified _id (aliased in the schema), no re-query needed
+                res = manager.close_trade(trade.id, exit_payload)
             else:
-                res = manager.partial_close(str(trade.id), exit_payload)
+                res = manager.partial_close(trade.id, exit_payload)
                 
-            await update.message.reply_text(
-                f"✅ Trade Updated!\n"
-                f"P&L: {res.get('pnl_rupiah', 0):,.0f} ({res.get('pnl_percent', 0):.2f}%)\n"
-                f"Status: {res.get('status', 'updated')}"
-            )
+            await update.message.reply_text(_CLOSED_TPL.format_map({
+                "pnl_rupiah": res.get("pnl_rupiah", 0),
+                "pnl_percent": res.get("pnl_percent", 0),
+                "status": res.get("status", "updated"),
+            }))
         except Exception as e:
             logger.error(f"Close failed: {e}")
             await update.message.reply_text(f"❌ Failed: {e}")
             
     return ConversationHandler.END
 
+# Every conversation step takes free text; compose the filter once and share it.
+# ConversationHandler already dispatches by state through its `states` dict.
+_TEXT_INPUT = filters.TEXT & ~filters.COMMAND
+
 add_trade_handler = ConversationHandler(
     entry_points=[CommandHandler("addtrade", start_add_trade)],
     states={
-        SYMBOL: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_symbol)],
-        DATE: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_date)],
-        PRICE: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_price)],
-        QTY: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_qty)],
-        STRATEGY: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_strategy)],
-        RISK: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_risk)],
-        EMOTION: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_emotion)],
-        NOTES: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_notes)],
-        CONFIRM_ADD: [MessageHandler(filters.TEXT & ~filters.COMMAND, confirm_add)]
+        SYMBOL: [MessageHandler(_TEXT_INPUT, add_symbol)],
+        DATE: [MessageHandler(_TEXT_INPUT, add_date)],
+        PRICE: [MessageHandler(_TEXT_INPUT, add_price)],
+        QTY: [MessageHandler(_TEXT_INPUT, add_qty)],
+        STRATEGY: [MessageHandler(_TEXT_INPUT, add_strategy)],
+        RISK: [MessageHandler(_TEXT_INPUT, add_risk)],
+        EMOTION: [MessageHandler(_TEXT_INPUT, add_emotion)],
+        NOTES: [MessageHandler(_TEXT_INPUT, add_notes)],
+        CONFIRM_ADD: [MessageHandler(_TEXT_INPUT, confirm_add)]
     },
     fallbacks=[CommandHandler("cancel", cancel)]
 )
@@ -384,14 +376,14 @@ add_trade_handler = ConversationHandler(
 close_trade_handler = ConversationHandler(
     entry_points=[CommandHandler("closetrade", start_close_trade)],
     states={
-        CLOSE_SELECT: [MessageHandler(filters.TEXT & ~filters.COMMAND, select_trade)],
-        CLOSE_TYPE: [MessageHandler(filters.TEXT & ~filters.COMMAND, close_type)],
-        CLOSE_QTY: [MessageHandler(filters.TEXT & ~filters.COMMAND, close_qty)],
-        CLOSE_PRICE: [MessageHandler(filters.TEXT & ~filters.COMMAND, close_price)],
-        CLOSE_FEES: [MessageHandler(filters.TEXT & ~filters.COMMAND, close_fees)],
-        CLOSE_DATE: [MessageHandler(filters.TEXT & ~filters.COMMAND, close_date)],
-        CLOSE_EMOTION: [MessageHandler(filters.TEXT & ~filters.COMMAND, close_emotion)],
-        CONFIRM_CLOSE: [MessageHandler(filters.TEXT & ~filters.COMMAND, confirm_close)]
+        CLOSE_SELECT: [MessageHandler(_TEXT_INPUT, select_trade)],
+        CLOSE_TYPE: [MessageHandler(_TEXT_INPUT, close_type)],
+        CLOSE_QTY: [MessageHandler(_TEXT_INPUT, close_qty)],
+        CLOSE_PRICE: [MessageHandler(_TEXT_INPUT, close_price)],
+        CLOSE_FEES: [MessageHandler(_TEXT_INPUT, close_fees)],
+        CLOSE_DATE: [MessageHandler(_TEXT_INPUT, close_date)],
+        CLOSE_EMOTION: [MessageHandler(_TEXT_INPUT, close_emotion)],
+        CONFIRM_CLOSE: [MessageHandler(_TEXT_INPUT, confirm_close)]
     },
     fallbacks=[CommandHandler("cancel", cancel)]
 )
@@ -1,11 +1,14 @@
 """Telegram bot handlers for watchlist management."""
 
+import time
+
 from telegram import Update
 from telegram.ext import ContextTypes
 from loguru import logger
 
 from db.repositories.stock_repo import StockRepository
 from db.schemas import StockCreate
+from bot.utils import get_repo
 from utils.exceptions import (
     StockRepoError, 
     WatchlistFullError, 
@@ -13,6 +16,14 @@ from utils.exceptions import (
     InvalidSymbolError
 )
 
+# Rendered /watchlist reply in bot_data as (monotonic ts, message); /add and /remove
+# drop it, the TTL covers writes made outside the bot (e.g. the dashboard)
+_WATCHLIST_KEY = "watchlist_msg"
+_WATCHLIST_TTL = 300.0
+
+# MarkdownV2 reserved characters, escaped in one translate() per symbol
+_MD2 = str.maketrans({c: "\\" + c for c in r"_*[]()~`>#+-=|{}.!"})
+
 async def handle_add_stock(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /add command to add a stock to the watchlist."""
     if not update.message or not context.args:
@@ -20,8 +31,8 @@ async def handle_add_stock(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     symbol = context.args[0].upper()
-    db = context.application.bot_data["db"]
-    repo = StockRepository(db)
+    repo = get_repo(context, StockRepository)
+    context.bot_data.pop(_WATCHLIST_KEY, None)
 
     try:
         # Pydantic validation via StockCreate
@@ -30,7 +41,7 @@ async def handle_add_stock(update: Update, context: ContextTypes.DEFAULT_TYPE):
         stock_data = StockCreate(symbol=symbol, name=name)
         repo.add_stock(stock_data)
         
-        logger.info(f"User added stock: {symbol}")
+        logger.info("User added stock: {}", symbol)
         await update.message.reply_text(f"✅ {symbol} berhasil ditambahkan ke watchlist.")
         
     except (WatchlistFullError, DuplicateStockError, InvalidSymbolError) as e:
@@ -46,12 +57,12 @@ async def handle_remove_stock(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
 
     symbol = context.args[0].upper()
-    db = context.application.bot_data["db"]
-    repo = StockRepository(db)
+    repo = get_repo(context, StockRepository)
+    context.bot_data.pop(_WATCHLIST_KEY, None)
 
     try:
         repo.deactivate_stock(symbol)
-        logger.info(f"User removed stock: {symbol}")
+        logger.info("User removed stock: {}", symbol)
         await update.message.reply_text(f"🗑️ {symbol} telah dihapus dari watchlist aktif.")
         
     except StockRepoError as e:
@@ -65,8 +76,12 @@ async def handle_list_watchlist(update: Update, context: ContextTypes.DEFAULT_TY
     if not update.message:
         return
         
-    db = context.application.bot_data["db"]
-    repo = StockRepository(db)
+    cached = context.bot_data.get(_WATCHLIST_KEY)
+    if cached and time.monotonic() - cached[0] < _WATCHLIST_TTL:
+        await update.message.reply_text(cached[1], parse_mode="MarkdownV2")
+        return
+        
+    repo = get_repo(context, StockRepository)
 
     try:
         stocks = repo.get_all_stocks(only_active=True)
@@ -74,12 +89,12 @@ async def handle_list_watchlist(update: Update, context: ContextTypes.DEFAULT_TY
             await update.message.reply_text("Watchlist kosong. Gunakan /add untuk menambah stock.")
             return
 
-        message = "📋 *Watchlist Aktif:*\n\n"
-        for i, stock in enumerate(stocks, 1):
-            # Escaping for MarkdownV2 is complex, using simple markdown or escaping dots
-            safe_symbol = stock.symbol.replace(".", "\\.")
-            message += f"{i}\\. `{safe_symbol}`\n"
+        message = "📋 *Watchlist Aktif:*\n\n" + "\n".join(
+            f"{i}\\. `{stock.symbol.translate(_MD2)}`"
+            for i, stock in enumerate(stocks, 1)
+        )
         
+        context.bot_data[_WATCHLIST_KEY] = (time.monotonic(), message)
         await update.message.reply_text(message, parse_mode="MarkdownV2")
         
     except Exception as e:
@@ -1,7 +1,8 @@
 import os
 import sys
 import asyncio
-import time
+import signal
+from importlib import import_module
 from telegram import Update, BotCommand, error as tg_error
 from telegram.ext import Application, CommandHandler, ContextTypes
 from telegram.request import HTTPXRequest
@@ -19,23 +20,12 @@ from bot.handlers.watchlist import (
     handle_list_watchlist
 )
 from bot.handlers.signal_handler import handle_signal_command
-from bot.handlers.analyze_handler import handle_analyze_command
 from bot.handlers.portfolio_handler import handle_capital_command, handle_risk_command
 from bot.handlers.trade_entry_handler import add_trade_handler, close_trade_handler
 from bot.handlers.follow_handler import handle_follow_command, handle_confirm_command
-from bot.handlers.journal_handler import (
-    handle_journal_command,
-    handle_stats_command,
-    handle_trade_detail_command,
-    handle_export_command
-)
 from bot.handlers.sizing_handler import handle_size_command
 from bot.handlers.heat_handler import handle_heat_command
-from bot.handlers.backtest_handler import backtest_command
-from bot.handlers.report_handler import report_command
 from bot.handlers.health_handler import health_command
-from bot.handlers.bandar_handler import handle_bandar_command
-from bot.handlers.insight_handler import handle_bias_command, handle_scores_command
 
 
 # ── Startup grace period ────────────────────────────────────────────────────────
@@ -43,27 +33,62 @@ from bot.handlers.insight_handler import handle_bias_command, handle_scores_comm
 # so the old bot instance stops polling before we begin.
 _STARTUP_GRACE = int(os.environ.get("BOT_STARTUP_GRACE_SECONDS", "30"))
 
-# Delay injected inside the error handler when Conflict is detected.
-# PTB re-tries get_updates after the error handler returns, so sleeping
-# here IS the backoff. 30 s is enough for Railway to kill old container.
-_CONFLICT_WAIT = int(os.environ.get("BOT_CONFLICT_WAIT_SECONDS", "30"))
+# Polling Conflicts (old container still running) are retried by PTB's own
+# network_retry_loop (1s, x1.5 up to 30s); the error handler runs in a separate
+# task and cannot delay the next getUpdates, so it only logs them.
+
+# ── Outbound HTTP ───────────────────────────────────────────────────────────────
+# HTTP/2 multiplexes concurrent replies over few TLS connections but needs the
+# optional `h2` package (httpx[http2]); without it we stay on HTTP/1.1.
+try:
+    import h2  # noqa: F401
+
+    _HTTP_VERSION = "2"
+except ImportError:  # pragma: no cover - depends on environment
+    _HTTP_VERSION = "1.1"
+
+_POOL_SIZE = 64
+
+# getUpdates long-poll window in seconds; one held request replaces many short polls
+_POLL_TIMEOUT = int(os.environ.get("BOT_POLL_TIMEOUT_SECONDS", "50"))
+
+# Signals that stop polling and run Application.shutdown() (PTB's default set)
+_STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM, signal.SIGABRT)
+
+# Only the update types our handlers consume (commands/conversation text, inline menu)
+_ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+
+
+def _build_request() -> HTTPXRequest:
+    """HTTPX transport for bot API calls (getUpdates keeps PTB's own separate request)."""
+    return HTTPXRequest(
+        connection_pool_size=_POOL_SIZE,
+        connect_timeout=10.0,
+        read_timeout=30.0,
+        write_timeout=30.0,
+        pool_timeout=5.0,
+        http_version=_HTTP_VERSION,
+    )
 
 
 async def _error_handler(update, context):
     """Global async error handler for the bot.
 
-    On Conflict we sleep inside the handler before PTB retries — this is
-    the correct PTB v20 pattern.  We do NOT call app.stop() / shutdown()
-    because those raise RuntimeError if the app is not yet fully running.
+    Polling errors arrive here via a task PTB creates, so nothing done here
+    gates the next getUpdates; PTB's retry loop does its own backoff.
+    We do NOT call app.stop() / shutdown() because those raise RuntimeError
+    if the app is not yet fully running.
     """
     err = context.error
     if isinstance(err, tg_error.Conflict):
         logger.warning(
-            f"⚡ Conflict: another bot instance still active. "
-            f"Waiting {_CONFLICT_WAIT}s before retry…"
+            "⚡ Conflict: another bot instance still active. "
+            "PTB keeps retrying getUpdates until it stops…"
         )
-        # Sleep here — PTB will retry get_updates after handler returns.
-        await asyncio.sleep(_CONFLICT_WAIT)
+    elif isinstance(err, tg_error.RetryAfter):
+        # Flood control hit by a handler send (polling RetryAfter is handled by PTB).
+        # Don't sleep: updates are processed one at a time and the send isn't retried.
+        logger.warning(f"Flood control: Telegram asks to wait {err.retry_after}s; message dropped")
     elif isinstance(err, tg_error.NetworkError):
         logger.warning(f"Network error (will retry): {err}")
         await asyncio.sleep(5)
@@ -73,70 +98,104 @@ async def _error_handler(update, context):
         logger.error(f"Unhandled bot error: {err}", exc_info=err)
 
 
+# ── Lazy handlers ───────────────────────────────────────────────────────────────
+# Analysis, journal, backtest and report handlers pull in pandas, numba,
+# matplotlib, yfinance, etc. Import them on the first matching command so the
+# bot reaches getUpdates without that cost.
+def _lazy(module: str, attr: str):
+    """Callback that imports `module` on first call and delegates to its `attr`."""
+    async def callback(update, context):
+        return await getattr(import_module(module), attr)(update, context)
+
+    callback.__name__ = attr
+    return callback
+
+
+# ── Command table ───────────────────────────────────────────────────────────────
+# Plain /command handlers; the trade conversations and the inline menu callback
+# handler are appended to the same add_handlers batch.
+_COMMANDS = (
+    # Menu & navigation
+    ("start", handle_start_command),
+    ("menu",  handle_menu_command),
+    # Watchlist
+    ("add",       handle_add_stock),
+    ("remove",    handle_remove_stock),
+    ("watchlist", handle_list_watchlist),
+    ("follow",    handle_follow_command),
+    ("confirm",   handle_confirm_command),
+    # Analisis & sinyal
+    ("signal",  handle_signal_command),
+    ("analyze", _lazy("bot.handlers.analyze_handler", "handle_analyze_command")),
+    ("bandar",  _lazy("bot.handlers.bandar_handler", "handle_bandar_command")),
+    ("bias",    _lazy("bot.handlers.insight_handler", "handle_bias_command")),
+    ("scores",  _lazy("bot.handlers.insight_handler", "handle_scores_command")),
+    # Jurnal
+    ("journal", _lazy("bot.handlers.journal_handler", "handle_journal_command")),
+    ("stats",   _lazy("bot.handlers.journal_handler", "handle_stats_command")),
+    ("trade",   _lazy("bot.handlers.journal_handler", "handle_trade_detail_command")),
+    ("export",  _lazy("bot.handlers.journal_handler", "handle_export_command")),
+    # Risk & sizing
+    ("size", handle_size_command),
+    ("heat", handle_heat_command),
+    # Portfolio
+    ("capital", handle_capital_command),
+    ("risk",    handle_risk_command),
+    ("health",  health_command),
+    # Riset & backtest
+    ("backtest", _lazy("bot.handlers.backtest_handler", "backtest_command")),
+    ("report",   _lazy("bot.handlers.report_handler", "report_command")),
+)
+
+
 class BotManager:
     """Manages Telegram bot application and handlers."""
 
     def __init__(self, db):
         self.db = db
+        self._build_app()
+
+    def _build_app(self):
+        """Build the Application with a fresh HTTP pool and register handlers."""
         self.app = (
             Application.builder()
             .token(settings.TELEGRAM_BOT_TOKEN)
-            .request(HTTPXRequest(connection_pool_size=8, connect_timeout=30.0, read_timeout=30.0))
+            .request(_build_request())
             .build()
         )
         # Store DB in bot_data for handlers access
-        self.app.bot_data["db"] = db
+        self.app.bot_data["db"] = self.db
         self._setup_handlers()
 
     def _setup_handlers(self):
         """Register command handlers."""
-        # ── Menu & navigation ─────────────────────────────────────────────
-        self.app.add_handler(CommandHandler("start", handle_start_command))
-        self.app.add_handler(CommandHandler("menu",  handle_menu_command))
-        self.app.add_handler(menu_callback_handler)   # inline keyboard callbacks
-
-        # ── Watchlist ───────────────────────────────────────────────────
-        self.app.add_handler(CommandHandler("add",       handle_add_stock))
-        self.app.add_handler(CommandHandler("remove",    handle_remove_stock))
-        self.app.add_handler(CommandHandler("watchlist", handle_list_watchlist))
-        self.app.add_handler(CommandHandler("follow",    handle_follow_command))
-        self.app.add_handler(CommandHandler("confirm",   handle_confirm_command))
-
-        # ── Analisis & sinyal ──────────────────────────────────────────
-        self.app.add_handler(CommandHandler("signal",  handle_signal_command))
-        self.app.add_handler(CommandHandler("analyze", handle_analyze_command))
-        self.app.add_handler(CommandHandler("bandar",  handle_bandar_command))
-        self.app.add_handler(CommandHandler("bias",    handle_bias_command))
-        self.app.add_handler(CommandHandler("scores",  handle_scores_command))
-
-        # ── Jurnal ────────────────────────────────────────────────────────
-        self.app.add_handler(CommandHandler("journal", handle_journal_command))
-        self.app.add_handler(CommandHandler("stats",   handle_stats_command))
-        self.app.add_handler(CommandHandler("trade",   handle_trade_detail_command))
-        self.app.add_handler(CommandHandler("export",  handle_export_command))
-        self.app.add_handler(add_trade_handler)
-        self.app.add_handler(close_trade_handler)
-
-        # ── Risk & sizing ───────────────────────────────────────────────
-        self.app.add_handler(CommandHandler("size",  handle_size_command))
-        self.app.add_handler(CommandHandler("heat",  handle_heat_command))
-
-        # ── Portfolio ─────────────────────────────────────────────────────
-        self.app.add_handler(CommandHandler("capital", handle_capital_command))
-        self.app.add_handler(CommandHandler("risk",    handle_risk_command))
-        self.app.add_handler(CommandHandler("health",  health_command))
-
-        # ── Riset & backtest ────────────────────────────────────────────
-        self.app.add_handler(CommandHandler("backtest", backtest_command))
-        self.app.add_handler(CommandHandler("report",   report_command))
+        self.app.add_handlers(
+            [CommandHandler(name, fn) for name, fn in _COMMANDS]
+            + [add_trade_handler, close_trade_handler, menu_callback_handler]
+        )
 
         # ── Error handler ────────────────────────────────────────────────
         self.app.add_error_handler(_error_handler)
 
-        # ── Register bot commands (auto-complete di keyboard Telegram) ─────────
-        self.app.post_init = self._set_bot_commands
+        # ── Startup grace + bot commands (auto-complete di keyboard Telegram) ──
+        self.app.post_init = self._post_init
         logger.info("Bot handlers registered successfully.")
 
+    @classmethod
+    async def _post_init(cls, app: Application) -> None:
+        """Startup grace before polling starts; the command list is set meanwhile.
+
+        Runs on the event loop after initialize() and before getUpdates begins,
+        so SIGTERM during the grace shuts down cleanly. set_my_commands does not
+        conflict with the old instance's polling.
+        """
+        if _STARTUP_GRACE > 0:
+            logger.info(
+                f"⏳ Waiting {_STARTUP_GRACE}s startup grace before polling "
+                "(lets old Railway container shut down)…"
+            )
+        await asyncio.gather(asyncio.sleep(_STARTUP_GRACE), cls._set_bot_commands(app))
+
     @staticmethod
     async def _set_bot_commands(app: Application) -> None:
         """Set bot command list so Telegram shows autocomplete on '/'."""
@@ -168,24 +227,24 @@ class BotManager:
         """Run the bot with startup grace period + PTB native Conflict handling.
 
         Strategy:
-        1. Wait _STARTUP_GRACE s upfront — avoids Conflict on most deploys.
-        2. If Conflict still occurs, the error handler sleeps _CONFLICT_WAIT s
-           inside PTB's retry loop (no RuntimeError, no stop/shutdown calls).
+        1. Wait _STARTUP_GRACE s in post_init, before polling starts — avoids
+           Conflict on most deploys.
+        2. If Conflict still occurs, PTB's polling retry loop backs off on its
+           own (up to 30s between attempts); the error handler only logs it
+           (no RuntimeError, no stop/shutdown calls).
         3. run_polling() is blocking and runs indefinitely until SIGTERM.
+           The stop signals are installed on the event loop before post_init,
+           so a SIGTERM during the grace or while polling shuts down cleanly.
         """
-        # ── Startup grace ───────────────────────────────────────────────────
-        if _STARTUP_GRACE > 0:
-            logger.info(
-                f"⏳ Waiting {_STARTUP_GRACE}s startup grace before polling "
-                "(lets old Railway container shut down)…"
-            )
-            time.sleep(_STARTUP_GRACE)
-
         logger.info("Starting Telegram bot (polling mode)…")
         try:
             self.app.run_polling(
+                poll_interval=0.0,
+                timeout=_POLL_TIMEOUT,      # long poll: Telegram holds getUpdates open
+                bootstrap_retries=-1,       # retry startup calls instead of crashing
                 drop_pending_updates=True,
-                allowed_updates=None,
+                allowed_updates=_ALLOWED_UPDATES,
+                stop_signals=_STOP_SIGNALS,  # Railway sends SIGTERM on redeploy
                 close_loop=False,
             )
             logger.info("Bot polling stopped gracefully.")
@@ -195,13 +254,5 @@ class BotManager:
 
     def _rebuild_app(self):
         """Rebuild the Application instance to get fresh connections after Conflict."""
-        from config.settings import settings
-        self.app = (
-            Application.builder()
-            .token(settings.TELEGRAM_BOT_TOKEN)
-            .request(HTTPXRequest(connection_pool_size=8, connect_timeout=30.0, read_timeout=30.0))
-            .build()
-        )
-        self.app.bot_data["db"] = self.db
-        self._setup_handlers()
+        self._build_app()
 
@@ -1,9 +1,17 @@
 """Bot utilities and decorators."""
-from functools import wraps
+import asyncio
+import sys
+import time
+from functools import lru_cache, wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 from telegram import Update
 from telegram.ext import ContextTypes
+from telegram.helpers import escape_markdown
 from config.settings import settings
 
+# Admin user ids, resolved once at import (TELEGRAM_CHAT_ID is validated numeric)
+_ADMIN_IDS: frozenset[int] = frozenset({int(settings.TELEGRAM_CHAT_ID)})
+
 def is_admin(func):
     """Decorator to restrict command access to admin only."""
     @wraps(func)
@@ -11,13 +19,110 @@ def is_admin(func):
         if not update.effective_user:
             return
             
-        user_id = update.effective_user.id
         # Allow if user_id matches TELEGRAM_CHAT_ID (assuming it's the admin ID)
-        # or if we add a dedicated ADMIN_IDS list later.
-        if str(user_id) != str(settings.TELEGRAM_CHAT_ID):
+        if update.effective_user.id not in _ADMIN_IDS:
             if update.effective_message:
                 await update.effective_message.reply_text("❌ Anda tidak memiliki akses untuk perintah ini.")
             return
             
         return await func(update, context, *args, **kwargs)
     return wrapper
+
+
+# Portfolio config changes rarely; keep it briefly to skip a Mongo round-trip per command
+_CONFIG_TTL = 30.0
+_CONFIG_CACHE: Dict[str, Tuple[float, Any]] = {}
+
+
+def get_config_cached(repo, user: str = "nesa"):
+    """PortfolioRepository.get_config behind a short per-user TTL cache."""
+    now = time.monotonic()
+    hit = _CONFIG_CACHE.get(user)
+    if hit and now - hit[0] < _CONFIG_TTL:
+        return hit[1]
+        
+    config = repo.get_config(user)
+    if config is not None:
+        _CONFIG_CACHE[user] = (now, config)
+    return config
+
+
+def invalidate_config_cache(user: Optional[str] = None) -> None:
+    """Drop cached portfolio config for `user` (or everyone) after a write."""
+    if user is None:
+        _CONFIG_CACHE.clear()
+    else:
+        _CONFIG_CACHE.pop(user, None)
+
+
+def get_repo(context: ContextTypes.DEFAULT_TYPE, repo_cls):
+    """Repository instance shared through bot_data, built on first use.
+    
+    Repositories are stateless wrappers around ``bot_data["db"]``, but some
+    (e.g. TradeRepository) issue create_index calls in ``__init__``.
+    """
+    repos = context.bot_data.setdefault("repos", {})
+    repo = repos.get(repo_cls)
+    if repo is None:
+        repo = repos[repo_cls] = repo_cls(context.bot_data["db"])
+    return repo
+
+
+async def reply_md(update, text: str):
+    """Reply to the triggering message with Markdown parsing enabled."""
+    return await update.message.reply_text(text, parse_mode="Markdown")
+
+
+@lru_cache(maxsize=1024)
+def md_escape(text: str) -> str:
+    """Escape stored text for legacy Markdown replies (memoized per value)."""
+    return escape_markdown(text, version=1)
+
+
+_JK = ".JK"
+
+
+@lru_cache(maxsize=4096)
+def normalize_symbol(symbol: str) -> str:
+    """Upper-case a user-typed ticker and append the IDX ``.JK`` suffix if missing."""
+    symbol = symbol.upper()
+    return sys.intern(symbol if symbol.endswith(_JK) else symbol + _JK)
+
+
+class TokenBucket:
+    """Async rate limiter allowing `rate` acquisitions per `per` seconds.
+    
+    Tokens may go negative: each caller reserves its slot synchronously and
+    then sleeps until it comes due, so no lock is needed (or tied to a loop).
+    """
+
+    def __init__(self, rate: float, per: float = 1.0):
+        self.capacity = float(rate)
+        self.interval = per / rate
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) / self.interval)
+        self._last = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens * self.interval)
+
+
+# Telegram allows ~30 messages/s per bot; stay under it
+_SEND_BUCKET = TokenBucket(rate=25, per=1.0)
+
+
+async def broadcast(send: Callable[..., Awaitable[Any]], chat_ids: Iterable, **kwargs) -> List[Any]:
+    """Send the same message to many chats concurrently, rate limited.
+    
+    `send` is a bound Bot method such as ``bot.send_message``. Returns one
+    result per chat; failures are returned as exceptions, not raised.
+    """
+    async def _send(chat_id):
+        await _SEND_BUCKET.acquire()
+        return await send(chat_id=chat_id, **kwargs)
+        
+    return await asyncio.gather(*(_send(c) for c in chat_ids), return_exceptions=True)
@@ -163,8 +163,7 @@ def main():
     portfolio_repo = PortfolioRepository(db)
 
     # Fetch only what's needed for non-CRUD pages
-    closed_trades   = trade_repo.get_all_closed_trades()
-    trade_dicts     = [t.model_dump() for t in closed_trades]
+    trade_dicts     = trade_repo.get_closed_trade_dicts()
     open_count      = len(trade_repo.get_open_trades())
 
     config          = portfolio_repo.get_config("nesa")
@@ -6,6 +6,7 @@ import plotly.graph_objects as go
 from db.repositories.backtest_repo import BacktestRepository
 from db.connection import get_database
 from dashboard.components.charts import _TEAL, _GREEN, _RED, _LAYOUT_BASE
+from utils.serialization import dump_models
 
 
 def render(db=None):
@@ -76,7 +77,7 @@ def render(db=None):
         st.warning("Tidak ada trade dalam hasil backtest ini.")
         return
 
-    df = pd.DataFrame([t.model_dump() for t in trades])
+    df = pd.DataFrame(dump_models(trades))
     df["exit_date"] = pd.to_datetime(df["exit_date"], errors="coerce")
     df = df.sort_values("exit_date")
     df["cumulative_pnl"] = df["pnl_rupiah"].cumsum()
@@ -11,6 +11,7 @@ import streamlit as st
 from db.repositories.trade_repo import TradeRepository
 from db.schemas import Trade, TradeLeg
 from journal.trade_manager import TradeManager
+from utils.serialization import dump_models
 
 
 # ── constants ─────────────────────────────────────────────────────────────────
@@ -71,7 +72,7 @@ def render(db):
     st.caption("Catat, pantau, dan analisis semua trade. Sinkron otomatis dengan bot Telegram.")
 
     # ── fetch all trades ──────────────────────────────────────────────────────
-    all_trades    = [t.model_dump() for t in repo.get_all_trades()]
+    all_trades    = dump_models(repo.get_all_trades())
     open_trades   = [t for t in all_trades if t.get("status") == "open"]
     closed_trades = [t for t in all_trades if t.get("status") == "closed"]
     draft_trades  = [t for t in all_trades if t.get("status") == "draft"]
@@ -21,6 +21,7 @@ from db.repositories.stock_repo import StockRepository
 from db.schemas import DailyPriceBase, PipelineRun, StockInDB
 from logic.indicators import IndicatorEngine, validate_sufficient_data
 from utils.exceptions import CakTykBotError, NetworkError
+from utils.serialization import dump_models
 from db.repositories.signal_repo import SignalRepository
 from db.repositories.portfolio_repo import PortfolioRepository
 from db.repositories.trade_repo import TradeRepository
@@ -218,7 +219,7 @@ class DataPipeline:
         ihsg_prices = self.price_repo.get_historical_prices("^JKSE", limit=250)
         ihsg_df = None
         if ihsg_prices:
-             ihsg_df = pd.DataFrame([p.model_dump() for p in ihsg_prices]).sort_values("date").reset_index(drop=True)
+             ihsg_df = pd.DataFrame(dump_models(ihsg_prices)).sort_values("date").reset_index(drop=True)
              ihsg_df = ihsg_df.rename(columns={
                 "open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"
              })
@@ -232,7 +233,7 @@ class DataPipeline:
                 if len(prices) < 200:
                     continue
                     
-                df = pd.DataFrame([p.model_dump() for p in prices]).sort_values("date").reset_index(drop=True)
+                df = pd.DataFrame(dump_models(prices)).sort_values("date").reset_index(drop=True)
                 
                 # Standardize column names to TitleCase for strategies
                 df = df.rename(columns={
@@ -129,6 +129,14 @@ def create_trades_indexes(db: Database) -> None:
         )
         logger.info("✅ Created index: trades.status")
         
+        # Compound index for open-trade lookups by user (and symbol)
+        collection.create_index(
+            [("user", ASCENDING), ("status", ASCENDING), ("symbol", ASCENDING)],
+            name="user_status_symbol",
+            background=False,
+        )
+        logger.info("✅ Created index: trades.(user, status, symbol)")
+        
         # Index for looking up trades by strategy
         collection.create_index(
             [("strategy", ASCENDING)],
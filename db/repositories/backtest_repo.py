@@ -10,6 +10,10 @@ from db.schemas import BacktestRun, BacktestTrade
 
 logger = logging.getLogger(__name__)
 
+# Document fields for a backtest trade (everything except the Mongo id)
+_TRADE_FIELDS = tuple(f for f in BacktestTrade.model_fields if f != "id")
+_BULK_CHUNK_SIZE = 1000
+
 class BacktestRepository:
     """Repository for Backtest runs and trades."""
     
@@ -40,6 +44,23 @@ class BacktestRepository:
         data = [t.model_dump(by_alias=True, exclude={"id"}) for t in trades]
         self.trades_collection.insert_many(data)
         
+    def bulk_save(self, run_id: str, strategy: str, trades: List[Dict], chunk_size: int = _BULK_CHUNK_SIZE):
+        """
+        Save raw engine trade dicts for a run without building BacktestTrade models.
+        
+        Only the BacktestTrade fields are stored; documents are written with
+        unordered insert_many in chunks of `chunk_size`.
+        """
+        if not trades:
+            return
+            
+        base = {"run_id": run_id, "strategy": strategy}
+        fields = [f for f in _TRADE_FIELDS if f not in base]
+        docs = [{**base, **{f: t[f] for f in fields}} for t in trades]
+        
+        for start in range(0, len(docs), chunk_size):
+            self.trades_collection.insert_many(docs[start:start + chunk_size], ordered=False)
+        
     def get_last_run(self, strategy: str = None) -> Optional[BacktestRun]:
         """Get the most recent backtest run."""
         query = {}
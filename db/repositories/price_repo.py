@@ -139,6 +139,28 @@ class PriceRepository:
         cursor = self.collection.find(query).sort("date", -1).limit(limit)
         return [DailyPriceInDB(**doc) for doc in cursor]
 
+    def get_historical_prices_raw(self, symbol: str, limit: int = 250) -> list[dict]:
+        """Get the latest price documents as plain dicts, oldest first.
+
+        Skips Pydantic validation for read-only analysis paths that build
+        DataFrames directly. Bookkeeping fields are projected out.
+
+        Args:
+            symbol: Ticker symbol
+            limit: Maximum records to return
+
+        Returns:
+            List of raw price dicts sorted by date ascending
+        """
+        cursor = (
+            self.collection.find({"symbol": symbol}, {"_id": 0, "symbol": 0, "fetched_at": 0})
+            .sort("date", -1)
+            .limit(limit)
+        )
+        docs = list(cursor)
+        docs.reverse()  # newest-first is needed for limit; callers want chronological
+        return docs
+
     def delete_all_for_stock(self, symbol: str) -> int:
         """Delete all price records for a specific stock.
 
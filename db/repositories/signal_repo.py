@@ -1,6 +1,7 @@
 """Signal repository for MongoDB."""
-from datetime import datetime, timezone
-from typing import List, Optional
+import time
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
 from pymongo.collection import Collection
 from pymongo.database import Database
@@ -8,6 +9,22 @@ from pymongo.database import Database
 from db.schemas import SignalInDB
 from engine.signal_generator import FinalSignal
 
+# Latest signal per (collection, symbol), shared across the per-request repository
+# instances. Entry: (monotonic ts, local date, signal); upsert_signal drops the entry.
+_LATEST_CACHE: Dict[Tuple[str, str], Tuple[float, date, Optional[SignalInDB]]] = {}
+_LATEST_CACHE_SIZE = 512
+_LATEST_TTL = 60.0
+
+# Today's signal list per (collection, verdict filter); upsert_signal clears it.
+# Entry: (monotonic ts, UTC midnight the list was fetched for, signals).
+_TODAY_CACHE: Dict[Tuple[str, Optional[str]], Tuple[float, datetime, List[SignalInDB]]] = {}
+_TODAY_TTL = 60.0
+
+
+def clear_today_signals_cache() -> None:
+    """Drop cached get_today_signals results (e.g. after a pipeline run)."""
+    _TODAY_CACHE.clear()
+
 
 class SignalRepository:
     """Repository for managing trading signals."""
@@ -50,25 +67,52 @@ class SignalRepository:
         }
         
         result = self.collection.update_one(query, update, upsert=True)
+        _LATEST_CACHE.pop((self.collection.full_name, signal_db.symbol), None)
+        _TODAY_CACHE.clear()
         return str(result.upserted_id or "updated")
 
     def get_today_signals(self, verdict_filter: Optional[str] = None) -> List[SignalInDB]:
         """
         Get all signals for today (UTC date).
         Currently relies on 'date' field being strict midnight UTC.
+        Results are cached for a minute; upsert_signal invalidates them.
         """
         # Determine 'today' based on server time or just use latest date in DB?
         # Ideally we query for a specific date range (today's date).
         now = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
         
+        key = (self.collection.full_name, verdict_filter)
+        ts = time.monotonic()
+        hit = _TODAY_CACHE.get(key)
+        if hit and hit[1] == now and ts - hit[0] < _TODAY_TTL:
+            return list(hit[2])
+            
         query = {"date": now}
         if verdict_filter:
             query["verdict"] = verdict_filter
             
         cursor = self.collection.find(query).sort("tech_score", -1)
-        return [SignalInDB(**doc) for doc in cursor]
+        signals = [SignalInDB(**doc) for doc in cursor]
+        _TODAY_CACHE[key] = (ts, now, signals)
+        return list(signals)
 
     def get_signal_by_symbol(self, symbol: str, limit: int = 7) -> List[SignalInDB]:
         """Get latest signals for a symbol."""
         cursor = self.collection.find({"symbol": symbol}).sort("date", -1).limit(limit)
         return [SignalInDB(**doc) for doc in cursor]
+
+    def get_latest_signal(self, symbol: str) -> Optional[SignalInDB]:
+        """Get the latest signal for a symbol, cached briefly within the day."""
+        now = time.monotonic()
+        today = datetime.now().date()
+        key = (self.collection.full_name, symbol)
+        hit = _LATEST_CACHE.get(key)
+        if hit and hit[1] == today and now - hit[0] < _LATEST_TTL:
+            return hit[2]
+            
+        signals = self.get_signal_by_symbol(symbol, limit=1)
+        signal = signals[0] if signals else None
+        if len(_LATEST_CACHE) >= _LATEST_CACHE_SIZE:
+            _LATEST_CACHE.pop(next(iter(_LATEST_CACHE))) # evict oldest
+        _LATEST_CACHE[key] = (now, today, signal)
+        return signal
@@ -1,15 +1,32 @@
 """Repository for Trade Management."""
 import logging
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
+import numpy as np
 from pymongo.database import Database
-from pymongo import DESCENDING
+from pymongo import DESCENDING, ReturnDocument
 
 from db.schemas import Trade, TradeLeg
+from utils.serialization import dump_models
 
 logger = logging.getLogger(__name__)
 
+# Closed trades as dicts for the analytics commands, keyed by (collection, user).
+# Entry: (monotonic ts, dicts); every write through TradeRepository clears it.
+_CLOSED_CACHE: Dict[Tuple[str, str], Tuple[float, List[dict]]] = {}
+_CLOSED_TTL = 60.0
+
+# Column arrays built from a cached dict list; valid while that list is current.
+_COLUMNS_CACHE: Dict[Tuple[str, str], Tuple[List[dict], Dict[str, np.ndarray]]] = {}
+
+
+def clear_closed_trades_cache() -> None:
+    """Drop cached closed-trade dicts (and their column arrays)."""
+    _CLOSED_CACHE.clear()
+    _COLUMNS_CACHE.clear()
+
 
 class TradeRepository:
     """Repository for managing trades in MongoDB."""
@@ -23,12 +40,30 @@ class TradeRepository:
         self.collection.create_index([("symbol", 1), ("entry_date", -1)])
         self.collection.create_index([("status", 1), ("entry_date", -1)])
         self.collection.create_index([("user", 1), ("entry_date", -1)])
+        # Open-trade lookups (/size, /heat, /closetrade) filter on user + status (+ symbol).
+        # Same name as db.indexes.create_trades_indexes: MongoDB rejects one key
+        # pattern under two names (IndexOptionsConflict)
+        self.collection.create_index(
+            [("user", 1), ("status", 1), ("symbol", 1)], name="user_status_symbol"
+        )
 
     def insert_trade(self, trade: Trade) -> str:
         """Insert a new trade."""
-        result = self.collection.insert_one(trade.model_dump())
+        result = self.collection.insert_one(trade.model_dump(exclude={"id"}))
+        clear_closed_trades_cache()
         return str(result.inserted_id)
 
+    def upsert_draft(self, trade: Trade) -> str:
+        """Replace the user's latest draft for the symbol (or insert one) in a single round-trip."""
+        doc = self.collection.find_one_and_replace(
+            {"user": trade.user, "symbol": trade.symbol, "status": "draft"},
+            trade.model_dump(exclude={"id"}),
+            sort=[("created_at", DESCENDING)],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return str(doc["_id"])
+
     def get_trade(self, trade_id: str) -> Optional[Trade]:
         """Get trade by ID."""
         # Need ObjectId import if we query by _id
@@ -50,6 +85,17 @@ class TradeRepository:
         cursor = self.collection.find(query).sort("entry_date", DESCENDING)
         return [Trade(**doc) for doc in cursor]
     
+    def get_latest_trade_by_symbol(
+        self, symbol: str, statuses: tuple = ("open", "closed"), user: str = "nesa"
+    ) -> Optional[Trade]:
+        """Get the latest trade for a symbol, preferring open over closed ones."""
+        doc = self.collection.find_one(
+            {"user": user, "symbol": symbol, "status": {"$in": list(statuses)}},
+            # "open" sorts after "closed", so DESC puts open positions first
+            sort=[("status", DESCENDING), ("entry_date", DESCENDING)],
+        )
+        return Trade(**doc) if doc else None
+
     def get_draft_trades(self, symbol: Optional[str] = None, user: str = "nesa") -> List[Trade]:
         """Get draft trades."""
         query = {"user": user, "status": "draft"}
@@ -64,6 +110,50 @@ class TradeRepository:
         cursor = self.collection.find({"user": user, "status": "closed"}).sort("exit_date", DESCENDING)
         return [Trade(**doc) for doc in cursor]
 
+    def get_trades_for_stats(self, user: str = "nesa") -> List[Trade]:
+        """Get closed trades plus open ones with realized partial-exit PnL."""
+        query = {
+            "user": user,
+            "$or": [
+                {"status": "closed"},
+                {"legs.0": {"$exists": True}, "pnl_rupiah": {"$nin": [None, 0]}},
+            ],
+        }
+        cursor = self.collection.find(query).sort("entry_date", DESCENDING)
+        return [Trade(**doc) for doc in cursor]
+
+    def get_closed_trade_dicts(self, user: str = "nesa") -> List[dict]:
+        """Closed trades as dicts (shared, treat as read-only), cached briefly."""
+        key = (self.collection.full_name, user)
+        now = time.monotonic()
+        hit = _CLOSED_CACHE.get(key)
+        if hit and now - hit[0] < _CLOSED_TTL:
+            return hit[1]
+            
+        trade_dicts = dump_models(self.get_all_closed_trades(user))
+        _CLOSED_CACHE[key] = (now, trade_dicts)
+        return trade_dicts
+
+    def get_closed_trade_columns(self, user: str = "nesa") -> Dict[str, np.ndarray]:
+        """Closed trades as column arrays (strategy, pnl_rupiah, holding_days).
+        
+        Shares the closed-trade dict cache and is rebuilt only when it refreshes.
+        Missing numbers become NaN.
+        """
+        trade_dicts = self.get_closed_trade_dicts(user)
+        key = (self.collection.full_name, user)
+        hit = _COLUMNS_CACHE.get(key)
+        if hit and hit[0] is trade_dicts:
+            return hit[1]
+            
+        columns = {
+            "strategy": np.array([t["strategy"] for t in trade_dicts], dtype=object),
+            "pnl_rupiah": np.array([t["pnl_rupiah"] for t in trade_dicts], dtype=np.float64),
+            "holding_days": np.array([t["holding_days"] for t in trade_dicts], dtype=np.float64),
+        }
+        _COLUMNS_CACHE[key] = (trade_dicts, columns)
+        return columns
+
     def get_last_trades(self, limit: int = 10, user: str = "nesa") -> List[Trade]:
         """Get last N trades (mixed status)."""
         cursor = self.collection.find({"user": user}).sort("entry_date", DESCENDING).limit(limit)
@@ -83,6 +173,7 @@ class TradeRepository:
             {"_id": ObjectId(trade_id)},
             {"$set": updates}
         )
+        clear_closed_trades_cache()
         return result.modified_count > 0
 
     def add_leg(self, trade_id: str, leg: TradeLeg, remaining_qty: int) -> bool:
@@ -101,17 +192,23 @@ class TradeRepository:
             {"_id": ObjectId(trade_id)},
             update
         )
+        clear_closed_trades_cache()
         return result.modified_count > 0
         
-    def close_trade(self, trade_id: str, final_data: Dict[str, Any]) -> bool:
-        """Mark trade as closed with final stats."""
+    def close_trade(self, trade_id: str, final_data: Dict[str, Any], leg: Optional[TradeLeg] = None) -> bool:
+        """Mark trade as closed with final stats, appending the closing `leg` in the same update."""
         from bson.objectid import ObjectId
         final_data["status"] = "closed"
         final_data["qty_remaining"] = 0
         final_data["updated_at"] = datetime.now()
         
+        update = {"$set": final_data}
+        if leg is not None:
+            update["$push"] = {"legs": leg.model_dump()}
+        
         result = self.collection.update_one(
             {"_id": ObjectId(trade_id)},
-            {"$set": final_data}
+            update
         )
+        clear_closed_trades_cache()
         return result.modified_count > 0
@@ -8,10 +8,11 @@ class Exporter:
     """Exports data to various formats."""
     
     @staticmethod
-    def to_csv(trades: List[Trade]) -> io.StringIO:
-        """Convert list of trades to CSV string buffer."""
-        output = io.StringIO()
-        writer = csv.writer(output)
+    def to_csv(trades: List[Trade]) -> io.BytesIO:
+        """Convert list of trades to a UTF-8 CSV byte buffer (encoded once, while writing)."""
+        output = io.BytesIO()
+        text = io.TextIOWrapper(output, encoding="utf-8", newline="")
+        writer = csv.writer(text)
         
         # Header
         writer.writerow([
@@ -41,5 +42,7 @@ class Exporter:
             ]
             writer.writerow(row)
             
+        text.flush()
+        text.detach()  # keep the BytesIO open when the wrapper goes away
         output.seek(0)
         return output
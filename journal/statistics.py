@@ -1,8 +1,25 @@
 """Statistics calculation module."""
 from typing import List, Dict, Any, Optional
 from db.schemas import Trade
+from utils.jit import njit
+import numpy as np
 import pandas as pd
 
+@njit(cache=True)
+def _summary_kernel(pnls):
+    """One pass over realized PnL: (num_wins, gross_profit, gross_loss)."""
+    num_wins = 0
+    gross_profit = 0.0
+    gross_loss = 0.0
+    for i in range(pnls.shape[0]):
+        v = pnls[i]
+        if v > 0:
+            num_wins += 1
+            gross_profit += v
+        else:
+            gross_loss -= v
+    return num_wins, gross_profit, gross_loss
+
 class StatisticsEngine:
     """Calculates trade statistics."""
     
@@ -22,17 +39,14 @@ class StatisticsEngine:
                 "avg_loss": 0.0
             }
             
-        wins = [t for t in trades if (t.pnl_rupiah or 0) > 0]
-        losses = [t for t in trades if (t.pnl_rupiah or 0) <= 0]
-        
-        num_wins = len(wins)
-        num_losses = len(losses)
+        # Missing PnL counts as a zero (losing) trade
+        pnls = np.fromiter((t.pnl_rupiah or 0 for t in trades), dtype=np.float64, count=total_trades)
+        num_wins, gross_profit, gross_loss = _summary_kernel(pnls)
+        num_wins = int(num_wins)
+        num_losses = total_trades - num_wins
         
         win_rate = (num_wins / total_trades) * 100
         
-        gross_profit = sum(t.pnl_rupiah for t in wins if t.pnl_rupiah)
-        gross_loss = abs(sum(t.pnl_rupiah for t in losses if t.pnl_rupiah))
-        
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
         total_pnl = gross_profit - gross_loss
         
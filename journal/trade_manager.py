@@ -62,6 +62,7 @@ class TradeManager:
         # Let's verify if legs exist.
         
         weighted_exit = exit_data["exit_price"]
+        final_leg = None
         
         if trade.legs:
             # Create a "virtual" leg for this final close to aggregate
@@ -83,8 +84,8 @@ class TradeManager:
             
             # Add this final leg to DB for completeness? 
             # Logic: close_trade implies finality. We can append leg OR just store final result.
-            # Storing final leg is good for history.
-            leg = TradeLeg(
+            # Storing final leg is good for history; it is pushed with the close update below.
+            final_leg = TradeLeg(
                 exit_date=exit_data["exit_date"],
                 exit_price=exit_data["exit_price"],
                 qty=trade.qty_remaining,
@@ -93,7 +94,6 @@ class TradeManager:
                 pnl_percent=pnl["pnl_percent"],
                 emotion_tag=exit_data.get("emotion_tag")
             )
-            self.repo.add_leg(trade_id, leg, 0)
 
 
         # Setup Entry SL for RR calc? Need SL to check RR.
@@ -122,7 +122,7 @@ class TradeManager:
             "emotion_tag": exit_data.get("emotion_tag") # Final emotion overrides? Or append?
         }
         
-        self.repo.close_trade(trade_id, update_data)
+        self.repo.close_trade(trade_id, update_data, leg=final_leg)
         return update_data
 
     def partial_close(self, trade_id: str, leg_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -156,25 +156,11 @@ class TradeManager:
         )
         
         remaining = trade.qty_remaining - leg_data["qty"]
-        self.repo.add_leg(trade_id, leg, remaining)
         
-        # If remaining is 0, auto close?
+        # If remaining is 0, auto close: aggregate the known legs plus this one and
+        # write leg + closed status in a single update (no add_leg / reload round-trips)
         if remaining == 0:
-            # We call close_trade logic but we just added the leg.
-            # close_trade expects to add the final leg? 
-            # My close_trade logic above handles "final leg".
-            # If we used partial_close for the last bit, we need to mark closed.
-            
-            # Re-aggregate
-            # trade.legs is stale (doesn't have the new one yet if we just added it to DB? 
-            # wait, add_leg updates DB. trade object is old).
-            
-            # Simple approach: If remaining 0, trigger update to "closed" with aggregated stats.
-            # We can reuse aggregation logic.
-            
-            # Fetch updated trade?
-            trade = self.repo.get_trade(trade_id) # Reload
-            legs = [l.model_dump() for l in trade.legs]
+            legs = [l.model_dump() for l in trade.legs] + [leg.model_dump()]
             agg = aggregate_partial_exists(legs, trade.qty)
             
             holding_days = calculate_holding_days(trade.entry_date, leg_data["exit_date"])
@@ -188,7 +174,8 @@ class TradeManager:
                 "win_loss": determine_win_loss(agg["total_pnl"]),
                 "emotion_tag": leg_data.get("emotion_tag") # Last emotion
             }
-            self.repo.close_trade(trade_id, update_data)
+            self.repo.close_trade(trade_id, update_data, leg=leg)
             return {**update_data, "status": "closed"}
             
+        self.repo.add_leg(trade_id, leg, remaining)
         return {**leg.model_dump(), "status": "open", "remaining": remaining}
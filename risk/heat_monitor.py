@@ -9,6 +9,9 @@ from risk.constants import (
     MSG_HEAT_LIMIT
 )
 
+# Trade fields calculate_portfolio_heat reads; use as the Mongo projection
+HEAT_PROJECTION = {"symbol": 1, "entry_price": 1, "qty": 1, "qty_remaining": 1, "risk_percent": 1, "_id": 0}
+
 def calculate_portfolio_heat(
     open_trades: List[Dict],
     total_capital: float,
@@ -1,5 +1,6 @@
 """Sector Mapping and Verification (RR-005)."""
 
+import time
 from typing import List, Dict, Tuple, Any
 from loguru import logger
 
@@ -10,6 +11,18 @@ from risk.constants import (
     MSG_SECTOR_LIMIT
 )
 
+# The sector map only changes when re-seeded; cache per-symbol lookups for /size.
+# Entry: (monotonic ts, (sector, market_cap_category)).
+_SECTOR_CACHE: Dict[str, Tuple[float, Tuple[str, str]]] = {}
+_SECTOR_CACHE_SIZE = 512
+_SECTOR_TTL = 3600.0
+
+
+def clear_sector_cache() -> None:
+    """Drop cached sector lookups (e.g. after re-seeding sector_map)."""
+    _SECTOR_CACHE.clear()
+
+
 def get_sector_info(symbol: str, db=None) -> Tuple[str, str]:
     """
     Get sector and market cap category for a symbol.
@@ -28,6 +41,20 @@ def get_sector_info(symbol: str, db=None) -> Tuple[str, str]:
     return "Other", "small"
 
 
+def get_sector_info_cached(symbol: str) -> Tuple[str, str]:
+    """get_sector_info against the default database, cached per symbol for an hour."""
+    now = time.monotonic()
+    hit = _SECTOR_CACHE.get(symbol)
+    if hit and now - hit[0] < _SECTOR_TTL:
+        return hit[1]
+        
+    info = get_sector_info(symbol)
+    if len(_SECTOR_CACHE) >= _SECTOR_CACHE_SIZE:
+        _SECTOR_CACHE.pop(next(iter(_SECTOR_CACHE))) # evict oldest
+    _SECTOR_CACHE[symbol] = (now, info)
+    return info
+
+
 def check_sector_limit(
     symbol: str, 
     sector: str, 
@@ -20,7 +20,9 @@ from db.repositories.pipeline_repo import PipelineRepository
 from db.repositories.price_repo import PriceRepository
 from db.repositories.stock_repo import StockRepository
 from db.repositories.trade_repo import TradeRepository
-from analytics.monthly_report import generate_pdf_report
+from analytics.monthly_report import generate_pdf_report, pdf_report_filename
+from bot.utils import broadcast
+from utils.serialization import dump_models
 from config.settings import settings
 import asyncio
 from telegram import Bot
@@ -63,11 +65,11 @@ def run_monthly_report_job():
         db = MongoManager().get_database()
         repo = TradeRepository(db)
         trades_objs = repo.get_all_closed_trades()
-        trades = [t.model_dump() for t in trades_objs]
+        trades = dump_models(trades_objs)
         
-        pdf_path = generate_pdf_report(trades, month, year)
+        pdf_bytes = generate_pdf_report(trades, month, year)
         
-        if pdf_path:
+        if pdf_bytes:
             # Send to Telegram Admin
             # We need async loop here? Scheduler runs in thread.
             # python-telegram-bot is async.
@@ -79,11 +81,16 @@ def run_monthly_report_job():
                 # Assuming 'nesa' or config.ADMIN_CHAT_ID
                 # Backlog: Store Chat ID. For now log it or try send if ID known.
                 if settings.TELEGRAM_CHAT_ID:
-                    await bot.send_document(
-                        chat_id=settings.TELEGRAM_CHAT_ID,
-                        document=open(pdf_path, 'rb'),
+                    results = await broadcast(
+                        bot.send_document,
+                        [settings.TELEGRAM_CHAT_ID],
+                        document=pdf_bytes,
+                        filename=pdf_report_filename(month, year),
                         caption=f"📅 Automated Monthly Report: {month}/{year}"
                     )
+                    for err in results:
+                        if isinstance(err, Exception):
+                            raise err
             
             # Run async function
             loop = asyncio.new_event_loop()
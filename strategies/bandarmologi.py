@@ -1,4 +1,5 @@
-from typing import Optional, Dict, Any, List
+from datetime import timedelta
+from typing import Optional, Dict, Any, List, Mapping, Union
 import pandas as pd
 import numpy as np
 
@@ -119,34 +120,35 @@ class BandarmologiStrategy(BaseStrategy):
             
         return None
 
-    def detect_accumulation(self, broker_data: pd.DataFrame) -> Dict[str, Any]:
+    def detect_accumulation(self, broker_data: Union[pd.DataFrame, Mapping[str, np.ndarray]]) -> Dict[str, Any]:
         """
         Detect consistency of top brokers buying.
-        Input DF: date, broker_code, net_value
+        Input: DataFrame or mapping of column arrays with date, broker_code, net_value
         """
-        # Ensure sorted by date ascending for analysis
-        df = broker_data.sort_values("date")
-        
-        # We need to pivot or group by date to see top brokers per day
-        # Or if input is list of summary for one symbol
+        dates = np.asarray(broker_data["date"])
+        codes = np.asarray(broker_data["broker_code"])
+        net = np.asarray(broker_data["net_value"], dtype=np.float64)
         
         # Logic: Look at last N days.
         # Identify top buyers in the period.
-        last_date = df["date"].max()
-        start_date = last_date - pd.Timedelta(days=self.min_accum_days + 5) # buffer
-        recent_df = df[df["date"] >= start_date]
+        last_date = dates.max()
+        start_date = last_date - timedelta(days=self.min_accum_days + 5) # buffer
+        recent = dates >= start_date
         
-        # Aggregate net value per broker
-        broker_totals = recent_df.groupby("broker_code")["net_value"].sum().sort_values(ascending=False)
+        # Aggregate net value per broker, largest first
+        brokers, inverse = np.unique(codes[recent], return_inverse=True)
+        totals = np.bincount(inverse, weights=net[recent], minlength=brokers.size)
+        order = np.argsort(-totals, kind="stable")
         
         # Filter for positive buyers only for accumulation check
-        top_buyers = broker_totals[broker_totals > 0].head(3)
+        top = order[totals[order] > 0][:3]
+        top_buy_val = float(totals[top].sum())
         
         # Check if top buyers are consistent or meaningful
         is_accumulating = False
         accum_days = 0 
         
-        if top_buyers.sum() > self.min_broker_value * self.min_accum_days:
+        if top_buy_val > self.min_broker_value * self.min_accum_days:
             is_accumulating = True
             accum_days = self.min_accum_days # Placeholder
 
@@ -154,26 +156,27 @@ class BandarmologiStrategy(BaseStrategy):
         return {
             "is_accumulating": is_accumulating,
             "days": accum_days,
-            "top_brokers": top_buyers.index.tolist(),
-            "top_buy_val": float(top_buyers.sum())
+            "top_brokers": brokers[top].tolist(),
+            "top_buy_val": top_buy_val
         }
 
-    def detect_foreign_flow(self, flow_data: pd.DataFrame) -> Dict[str, Any]:
+    def detect_foreign_flow(self, flow_data: Union[pd.DataFrame, Mapping[str, np.ndarray]]) -> Dict[str, Any]:
         """
         Detect foreign net buy streak.
-        Input DF: date, foreign_net
+        Input: DataFrame or mapping of column arrays with date, foreign_net
         """
-        df = flow_data.sort_values("date")
-        recent = df.tail(self.min_foreign_flow_days)
+        order = np.argsort(np.asarray(flow_data["date"]), kind="stable")
+        net = np.asarray(flow_data["foreign_net"], dtype=np.float64)[order]
+        recent = net[-self.min_foreign_flow_days:]
         
-        net_total = recent["foreign_net"].sum()
-        positive_days = (recent["foreign_net"] > 0).sum()
+        net_total = recent.sum()
+        positive_days = (recent > 0).sum()
         
         is_buying = (positive_days >= self.min_foreign_flow_days - 1) and (net_total > self.min_foreign_flow_total)
         
         return {
             "is_foreign_buying": bool(is_buying),
-            "net_7d": float(df.tail(7)["foreign_net"].sum()),
+            "net_7d": float(net[-7:].sum()),
             "consecutive_days": int(positive_days)
         }
 
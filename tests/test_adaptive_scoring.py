@@ -57,6 +57,18 @@ def test_detect_biases(scoring_trades):
     biases = detect_biases(scoring_trades)
     assert any("Loss Aversion" in b for b in biases)
 
+def test_column_arrays_match_dicts(scoring_trades):
+    import numpy as np
+
+    columns = {
+        "strategy": np.array([t["strategy"] for t in scoring_trades], dtype=object),
+        "pnl_rupiah": np.array([t["pnl_rupiah"] for t in scoring_trades], dtype=np.float64),
+        "holding_days": np.array([(t["exit_date"] - t["entry_date"]).days for t in scoring_trades], dtype=np.float64),
+    }
+    assert calculate_strategy_scores(columns) == calculate_strategy_scores(scoring_trades)
+    assert detect_biases(columns) == detect_biases(scoring_trades)
+    assert calculate_strategy_scores({"strategy": np.array([]), "pnl_rupiah": np.array([])}) == {}
+
 def test_generate_monthly_report(scoring_trades):
     report = generate_monthly_report(scoring_trades, 1, 2024)
     assert "# Monthly Trading Report: 1/2024" in report
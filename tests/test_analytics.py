@@ -2,7 +2,7 @@ import pytest
 import pandas as pd
 from datetime import datetime
 from analytics.equity_curve import calculate_equity_curve
-from analytics.breakdown import analyze_by_strategy, analyze_by_sector
+from analytics.breakdown import analyze_by_strategy, analyze_by_sector, analyze_by_holding_period
 from analytics.psychology import analyze_emotions
 
 @pytest.fixture
@@ -64,3 +64,29 @@ class TestAnalytics:
         disc = df[df["emotion"] == "Disciplined"].iloc[0]
         assert disc["trades"] == 2
         assert disc["win_rate"] == 100.0
+
+    def test_breakdown_profit_factor(self, sample_trades):
+        df = analyze_by_strategy(sample_trades)
+        vcp = df[df["strategy"] == "VCP"].iloc[0]
+        ema = df[df["strategy"] == "EMA"].iloc[0]
+        assert vcp["profit_factor"] == 2.0
+        assert vcp["win_rate"] == 50.0
+        assert ema["profit_factor"] == float("inf")
+
+    def test_analyze_by_holding_period(self, sample_trades):
+        df = analyze_by_holding_period(sample_trades)
+        assert list(df["period"]) == ["1-7d", "8-14d", "15-30d"]
+        assert list(df["trades"]) == [1, 1, 1]
+
+def test_statistics_summary_single_pass():
+    from types import SimpleNamespace
+    from journal.statistics import StatisticsEngine
+
+    trades = [SimpleNamespace(pnl_rupiah=p) for p in (3000.0, -1000.0, None, 0.0, 1000.0)]
+    stats = StatisticsEngine.calculate_summary(trades)
+    assert stats["win_loss_ratio"] == "2:3"
+    assert stats["win_rate"] == 40.0
+    assert stats["profit_factor"] == 4.0
+    assert stats["total_pnl"] == 3000.0
+    assert stats["avg_win"] == 2000.0
+    assert stats["avg_loss"] == 1000.0 / 3
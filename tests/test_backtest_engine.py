@@ -51,6 +51,13 @@ def test_backtest_engine_load_data(mock_db, mock_repos):
     
     assert "BBCA.JK" in engine.price_cache
     assert len(engine.price_cache["BBCA.JK"]) == 2
+    
+    df = engine.price_cache["BBCA.JK"]
+    assert df.index.is_monotonic_increasing
+    assert df["close"].dtype == "float64"
+    assert df["ema_21"].isna().all() # missing indicators are NaN, not None
+    assert engine.ohlc_cache["BBCA.JK"].flags.c_contiguous
+    assert list(engine.ohlc_cache["BBCA.JK"][:, 3]) == [1050.0, 1100.0]
 
 def test_backtest_engine_execution(mock_db, mock_repos):
     price_repo, stock_repo, backtest_repo = mock_repos
@@ -106,4 +113,68 @@ def test_backtest_engine_execution(mock_db, mock_repos):
         # It passes data slice to analyze.
         
         assert backtest_repo.create_run.called
-        assert backtest_repo.save_trades.called
+        assert backtest_repo.bulk_save.called
+
+def test_check_exits_kernel():
+    from backtest.engine import check_exits
+    import numpy as np
+
+    # open, high, low, close
+    bars = np.array([
+        [1000.0, 1010.0, 890.0, 950.0],   # SL hit intraday -> fill at SL
+        [850.0, 870.0, 840.0, 860.0],     # gap down below SL -> fill at open
+        [1000.0, 1250.0, 990.0, 1200.0],  # TP hit
+        [1000.0, 1050.0, 950.0, 1020.0],  # timeout -> close
+        [1000.0, 1050.0, 950.0, 1020.0],  # still open
+    ])
+    sl = np.full(5, 900.0)
+    tp = np.full(5, 1200.0)
+    held = np.array([1, 1, 1, 91, 10])
+
+    prices, reasons = check_exits(bars, sl, tp, held, 90)
+
+    assert list(reasons) == [1, 1, 2, 3, 0]
+    assert list(prices[:4]) == [900.0, 850.0, 1200.0, 1020.0]
+
+def test_trading_days_only_dates_with_data(mock_db, mock_repos):
+    price_repo, stock_repo, _ = mock_repos
+    stock_repo.get_active_stocks.return_value = [
+        StockInDB(symbol="BBCA.JK", name="BCA", market_cap="large")
+    ]
+    # Fri, Mon (weekend gap) and a bar before the backtest range
+    price_repo.get_historical_prices.return_value = [
+        DailyPriceInDB(
+            symbol="BBCA.JK", date=d,
+            open=1000, high=1100, low=900, close=1050, volume=1000, adjusted_close=1050
+        )
+        for d in (datetime(2023, 1, 9), datetime(2023, 1, 6), datetime(2022, 12, 30))
+    ]
+
+    engine = BacktestEngine(mock_db, "vcp", datetime(2023, 1, 1), datetime(2023, 1, 31))
+    engine.load_data()
+
+    assert engine.trading_days == [datetime(2023, 1, 6), datetime(2023, 1, 9)]
+
+def test_price_cache_reused_across_runs(mock_db, mock_repos):
+    from backtest.engine import clear_price_cache
+    price_repo, stock_repo, _ = mock_repos
+    clear_price_cache()
+    stock_repo.get_active_stocks.return_value = [
+        StockInDB(symbol="BBCA.JK", name="BCA", market_cap="large")
+    ]
+    bar = DailyPriceInDB(
+        symbol="BBCA.JK", date=datetime(2023, 1, 2),
+        open=1000, high=1100, low=900, close=1050, volume=1000, adjusted_close=1050
+    )
+    price_repo.get_historical_prices.return_value = [bar]
+    price_repo.get_latest_price.return_value = bar
+
+    for _ in range(2):
+        BacktestEngine(mock_db, "vcp", datetime(2023, 1, 1), datetime(2023, 1, 31)).load_data()
+    assert price_repo.get_historical_prices.call_count == 1
+
+    # A newer stored bar invalidates the cached entry
+    price_repo.get_latest_price.return_value = bar.model_copy(update={"date": datetime(2023, 1, 3)})
+    BacktestEngine(mock_db, "vcp", datetime(2023, 1, 1), datetime(2023, 1, 31)).load_data()
+    assert price_repo.get_historical_prices.call_count == 2
+    clear_price_cache()
@@ -57,6 +57,23 @@ class TestBandarmologiStrategy:
         assert result["is_foreign_buying"] is True
         assert result["consecutive_days"] >= 2
 
+    def test_detect_from_column_arrays(self, strategy):
+        dates = np.array(pd.date_range(end=datetime.now(), periods=5))
+        broker = {
+            "date": np.repeat(dates, 2),
+            "broker_code": np.array(["YP", "KK"] * 5),
+            "net_value": np.array([2000.0, -1000.0] * 5),
+        }
+        flow = {"date": dates[::-1], "foreign_net": np.array([300.0, 300.0, 300.0, 100.0, 100.0])}
+        
+        accum = strategy.detect_accumulation(broker)
+        foreign = strategy.detect_foreign_flow(flow)
+        
+        assert accum["top_brokers"] == ["YP"]
+        assert accum["top_buy_val"] == 10000.0
+        assert foreign["is_foreign_buying"] is True
+        assert foreign["net_7d"] == 1100.0
+
     def test_detect_base_formation(self, strategy, mock_price_data):
         # The mock data has a tight range from index 5 to 8 (low volatility)
         # But we pass the whole DF logic uses tail(period)
@@ -23,8 +23,8 @@ def mock_context():
     """Create a mock Telegram context."""
     context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
     context.args = []
-    # Mock bot_data with a mock DB
-    context.application.bot_data = {"db": MagicMock()}
+    # Mock bot_data with a mock DB (context.bot_data is the application's dict)
+    context.application.bot_data = context.bot_data = {"db": MagicMock()}
     return context
 
 
@@ -108,6 +108,25 @@ async def test_handle_list_watchlist_with_data(mock_update, mock_context):
         assert call_args[1]["parse_mode"] == "MarkdownV2"
 
 
+@pytest.mark.asyncio
+async def test_handle_list_watchlist_cached_until_add(mock_update, mock_context):
+    """Rendered /watchlist is reused until /add invalidates it."""
+    mock_stock = MagicMock()
+    mock_stock.symbol = "BBCA.JK"
+    
+    with patch("bot.handlers.watchlist.StockRepository") as MockRepo:
+        get_all = MockRepo.return_value.get_all_stocks
+        get_all.return_value = [mock_stock]
+        
+        await handle_list_watchlist(mock_update, mock_context)
+        await handle_list_watchlist(mock_update, mock_context)
+        assert get_all.call_count == 1
+        
+        mock_context.args = ["TLKM"]
+        await handle_add_stock(mock_update, mock_context)
+        await handle_list_watchlist(mock_update, mock_context)
+        assert get_all.call_count == 2
+
 @pytest.mark.asyncio
 async def test_handle_add_stock_full_error(mock_update, mock_context):
     """Test adding stock when watchlist is full."""
@@ -178,3 +197,168 @@ async def test_handle_remove_stock_missing_args(mock_update, mock_context):
     mock_context.args = []
     await handle_remove_stock(mock_update, mock_context)
     mock_update.message.reply_text.assert_called_with("Format salah. Gunakan: /remove SYMBOL.JK")
+
+
+def test_get_config_cached_until_invalidated():
+    from bot.utils import get_config_cached, invalidate_config_cache
+
+    repo = MagicMock()
+    invalidate_config_cache()
+    assert get_config_cached(repo, "nesa") is get_config_cached(repo, "nesa")
+    assert repo.get_config.call_count == 1
+
+    invalidate_config_cache("nesa")
+    get_config_cached(repo, "nesa")
+    assert repo.get_config.call_count == 2
+    invalidate_config_cache()
+
+
+@pytest.mark.asyncio
+async def test_is_admin_rejects_other_users(mock_update, mock_context):
+    from bot.utils import _ADMIN_IDS, is_admin
+
+    handler = AsyncMock()
+    guarded = is_admin(handler)
+    mock_update.effective_user.id = next(iter(_ADMIN_IDS)) + 1
+    mock_update.effective_message = AsyncMock()
+    await guarded(mock_update, mock_context)
+    handler.assert_not_called()
+
+    mock_update.effective_user.id = next(iter(_ADMIN_IDS))
+    await guarded(mock_update, mock_context)
+    handler.assert_awaited_once()
+
+
+def test_normalize_symbol():
+    from bot.utils import normalize_symbol
+
+    assert normalize_symbol("bbca") == "BBCA.JK"
+    assert normalize_symbol("BBCA.JK") == "BBCA.JK"
+    assert normalize_symbol("bbca") is normalize_symbol("BBCA")
+
+
+@pytest.mark.asyncio
+async def test_capital_view_uses_cached_config(mock_update, mock_context):
+    from bot.handlers import portfolio_handler
+    from bot.utils import invalidate_config_cache
+    from db.schemas import PortfolioConfig
+
+    mock_context.bot_data = {"db": MagicMock()}
+    invalidate_config_cache()
+    with patch.object(portfolio_handler, "PortfolioRepository") as MockRepo:
+        repo = MockRepo.return_value
+        repo.get_config.return_value = PortfolioConfig(user="nesa", total_capital=1e8, risk_per_trade=0.01)
+        await portfolio_handler.handle_capital_command(mock_update, mock_context)
+        await portfolio_handler.handle_risk_command(mock_update, mock_context)
+        assert repo.get_config.call_count == 1
+
+        # Setting capital invalidates, so the next view re-reads
+        mock_context.args = ["200000000"]
+        await portfolio_handler.handle_capital_command(mock_update, mock_context)
+        mock_context.args = []
+        await portfolio_handler.handle_capital_command(mock_update, mock_context)
+        assert repo.get_config.call_count == 2
+        repo.update_capital.assert_called_once_with("nesa", 200000000.0)
+    invalidate_config_cache()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_sends_to_every_chat():
+    from bot.utils import broadcast
+
+    send = AsyncMock(side_effect=["ok", RuntimeError("blocked"), "ok"])
+    results = await broadcast(send, [1, 2, 3], text="hi")
+
+    assert send.await_count == 3
+    assert {c.kwargs["chat_id"] for c in send.await_args_list} == {1, 2, 3}
+    assert sum(isinstance(r, RuntimeError) for r in results) == 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_out_bursts():
+    import time
+    from bot.utils import TokenBucket
+
+    bucket = TokenBucket(rate=2, per=0.1)
+    start = time.monotonic()
+    for _ in range(4):
+        await bucket.acquire()
+    # Two tokens are available up front, the next two wait one interval each
+    assert time.monotonic() - start >= 0.09
+
+
+def test_get_repo_reuses_instance_per_application():
+    from bot.utils import get_repo
+
+    context = MagicMock()
+    context.bot_data = {"db": MagicMock()}
+    repo_cls = MagicMock()
+    assert get_repo(context, repo_cls) is get_repo(context, repo_cls)
+    repo_cls.assert_called_once_with(context.bot_data["db"])
+
+
+def test_md_escape_legacy_markdown():
+    from bot.utils import md_escape
+
+    assert md_escape("ema_pullback") == "ema\\_pullback"
+    assert md_escape("BBCA.JK") == "BBCA.JK"
+    assert md_escape("*big* [win]") == "\\*big\\* \\[win]"
+
+
+@pytest.mark.asyncio
+async def test_signal_reply_reused_for_same_signals(mock_update):
+    from types import SimpleNamespace
+    from bot.handlers import signal_handler
+
+    def make_signal():
+        return SimpleNamespace(verdict="BUY", risk_blocked=False, lot_size=None, heat_before=None,
+                               heat_after=None, symbol="BBCA.JK", strategy_source="vcp",
+                               entry_price=9000.0, sl_price=8500.0, tp_price=10000.0,
+                               rr_ratio=2.0, confidence="High")
+
+    context = MagicMock()
+    context.bot_data = {"db": MagicMock()}
+    signal = make_signal()
+    with patch.object(signal_handler, "SignalRepository") as MockRepo, \
+         patch.object(signal_handler, "_render_signals", wraps=signal_handler._render_signals) as render:
+        MockRepo.return_value.get_today_signals.side_effect = lambda: [signal]
+        await signal_handler.handle_signal_command(mock_update, context)
+        await signal_handler.handle_signal_command(mock_update, context)
+        assert render.call_count == 1
+
+        # A refreshed signal list renders again
+        MockRepo.return_value.get_today_signals.side_effect = lambda: [make_signal()]
+        await signal_handler.handle_signal_command(mock_update, context)
+        assert render.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_size_short_circuits_when_heat_limit_exceeded(mock_update, mock_context):
+    from types import SimpleNamespace
+    from bot.handlers import sizing_handler
+
+    config = SimpleNamespace(user="nesa", total_capital=100_000_000, risk_per_trade=0.05, max_heat=0.01)
+    mock_context.args = ["BBCA.JK", "7200", "6800"]
+    mock_context.bot_data["db"].trades.find.return_value = []
+    with patch.object(sizing_handler, "get_config_cached", return_value=config), \
+         patch.object(sizing_handler, "get_sector_info_cached", return_value=("Finance", "large")):
+        await sizing_handler.handle_size_command(mock_update, mock_context)
+
+    mock_update.message.reply_text.assert_called_once_with("🔴 Heat limit exceeded (1.4% > 1.0%)")
+
+
+@pytest.mark.asyncio
+async def test_report_sends_pdf_from_memory(mock_update, mock_context):
+    from bot.handlers import report_handler
+
+    mock_context.args = ["1", "2023"]
+    status_msg = mock_update.message.reply_text.return_value
+    with patch.object(report_handler, "TradeRepository"), \
+         patch.object(report_handler, "generate_markdown_report", return_value="# Report"), \
+         patch.object(report_handler, "generate_pdf_report", return_value=b"%PDF-1.3"):
+        await report_handler.report_command(mock_update, mock_context)
+
+    status_msg.edit_text.assert_called_once_with("# Report", parse_mode="Markdown")
+    mock_update.message.reply_document.assert_called_once_with(
+        document=b"%PDF-1.3", filename="report_2023_1.pdf", caption="📄 Detailed Report 1/2023"
+    )
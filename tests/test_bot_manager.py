@@ -35,3 +35,13 @@ def test_bot_manager_run(MockBuilder):
     with patch.object(mock_app, "run_polling") as mock_run_polling:
         manager.run()
         mock_run_polling.assert_called_once_with(drop_pending_updates=True)
+
+def test_lazy_handler_imports_on_first_call():
+    import asyncio
+    from bot.manager import _lazy
+    
+    callback = _lazy("bot.handlers.report_handler", "report_command")
+    assert callback.__name__ == "report_command"
+    with patch("bot.handlers.report_handler.report_command", return_value="done") as report_command:
+        assert asyncio.run(callback("update", "context")) == "done"
+        report_command.assert_called_once_with("update", "context")
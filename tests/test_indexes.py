@@ -8,6 +8,7 @@ from db.indexes import (
     create_stocks_indexes, 
     create_daily_prices_indexes, 
     create_pipeline_runs_indexes,
+    create_trades_indexes,
     list_indexes,
     drop_all_indexes
 )
@@ -61,6 +62,26 @@ class TestIndexes:
         with pytest.raises(OperationFailure):
             create_pipeline_runs_indexes(mock_db)
 
+    def test_create_trades_indexes_includes_open_trade_lookup(self):
+        mock_db = MagicMock()
+        create_trades_indexes(mock_db)
+        names = [c.kwargs["name"] for c in mock_db.trades.create_index.call_args_list]
+        assert "user_status_symbol" in names
+
+    def test_trades_index_names_agree_with_repository(self):
+        """Each trades key pattern must have one name (real MongoDB raises IndexOptionsConflict)."""
+        from db.repositories.trade_repo import TradeRepository
+        mock_db = MagicMock()
+        create_trades_indexes(mock_db)
+        TradeRepository(mock_db)
+        
+        names = {}
+        for call in mock_db.trades.create_index.call_args_list:
+            keys = tuple(call.args[0])
+            default = "_".join(f"{field}_{direction}" for field, direction in keys)
+            names.setdefault(keys, set()).add(call.kwargs.get("name", default))
+        assert all(len(n) == 1 for n in names.values()), names
+
     @patch("db.indexes.get_database")
     @patch("db.indexes.create_stocks_indexes")
     @patch("db.indexes.create_daily_prices_indexes")
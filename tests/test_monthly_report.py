@@ -9,13 +9,16 @@ mock_plt_module = MagicMock()
 mock_pdf_module = MagicMock()
 sys.modules["matplotlib"] = MagicMock()
 sys.modules["matplotlib.pyplot"] = mock_plt_module
+sys.modules["matplotlib.figure"] = MagicMock()
+sys.modules["matplotlib.backends"] = MagicMock()
+sys.modules["matplotlib.backends.backend_agg"] = MagicMock()
 sys.modules["fpdf"] = MagicMock()
 sys.modules["fpdf"].FPDF = MagicMock()
 
 from datetime import datetime
 import pandas as pd
 # Now import module under test
-from analytics.monthly_report import generate_markdown_report, generate_pdf_report
+from analytics.monthly_report import generate_markdown_report, generate_pdf_report, clear_report_cache
 
 @pytest.fixture
 def mock_trades():
@@ -44,23 +47,60 @@ def mock_trades():
         }
     ]
 
-@patch("analytics.monthly_report.plt")
+@patch("analytics.monthly_report._CHART_CANVAS")
+@patch("analytics.monthly_report._CHART_FIG")
 @patch("analytics.monthly_report.PDFReport")
 @patch("analytics.monthly_report.os")
-def test_generate_pdf_report(mock_os, MockPDFReport, mock_plt, mock_trades):
+def test_generate_pdf_report(mock_os, MockPDFReport, mock_fig, mock_canvas, mock_trades):
     # Setup Mocks
     mock_pdf_instance = MockPDFReport.return_value
-    mock_os.path.join.return_value = "/tmp/report.pdf"
+    mock_pdf_instance.output.return_value = bytearray(b"%PDF-1.3")
     mock_os.path.exists.return_value = False 
     
     # Run
-    path = generate_pdf_report(mock_trades, 1, 2023)
+    clear_report_cache()
+    pdf_bytes = generate_pdf_report(mock_trades, 1, 2023)
+    # Cache hit hands back the same bytes without rendering again
+    assert generate_pdf_report(mock_trades, 1, 2023) is pdf_bytes
+    clear_report_cache() # don't leak the mocked PDF bytes into other tests
     
     # Verify basics
-    assert path == "/tmp/report.pdf"
+    assert pdf_bytes == b"%PDF-1.3"
+    assert MockPDFReport.call_count == 1
     assert mock_pdf_instance.add_page.called
     assert mock_pdf_instance.output.called
     
     # Verify Chart generation
-    assert mock_plt.figure.called
-    assert mock_plt.savefig.called
+    assert mock_fig.add_subplot.called
+    assert mock_canvas.print_png.called
+
+def test_markdown_report_cached_per_month_signature(mock_trades):
+    clear_report_cache()
+    first = generate_markdown_report(mock_trades, 1, 2023)
+    assert generate_markdown_report(list(mock_trades), 1, 2023) is first
+    
+    # A newly closed trade in the month changes the signature
+    extra = dict(mock_trades[0], exit_date=datetime(2023, 1, 25), pnl_rupiah=20000)
+    updated = generate_markdown_report(mock_trades + [extra], 1, 2023)
+    assert updated is not first
+    assert "(2/3)" in updated
+    clear_report_cache()
+
+@pytest.mark.parametrize("field, value", [
+    ("strategy", "breakout"),       # same count / PnL / latest exit
+    ("pnl_percent", 9.9),
+    ("exit_date", datetime(2023, 1, 16)),  # not the month's latest exit
+])
+def test_markdown_report_cache_sees_edited_trades(mock_trades, field, value):
+    clear_report_cache()
+    first = generate_markdown_report(mock_trades, 1, 2023)
+    edited = [dict(mock_trades[0], **{field: value}), mock_trades[1]]
+    assert generate_markdown_report(edited, 1, 2023) is not first
+    clear_report_cache()
+
+def test_markdown_report_cache_sees_offsetting_pnl_edits(mock_trades):
+    clear_report_cache()
+    first = generate_markdown_report(mock_trades, 1, 2023)
+    edited = [dict(mock_trades[0], pnl_rupiah=110000), dict(mock_trades[1], pnl_rupiah=-60000)]
+    assert generate_markdown_report(edited, 1, 2023) is not first
+    clear_report_cache()
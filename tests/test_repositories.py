@@ -5,7 +5,10 @@ from datetime import datetime, timezone
 from db.repositories.stock_repo import StockRepository
 from db.repositories.price_repo import PriceRepository
 from db.repositories.pipeline_repo import PipelineRepository
-from db.schemas import StockCreate, StockUpdate, DailyPriceBase, PipelineRun
+from db.repositories.backtest_repo import BacktestRepository
+from db.repositories.trade_repo import TradeRepository
+from db.repositories.signal_repo import SignalRepository
+from db.schemas import StockCreate, StockUpdate, DailyPriceBase, PipelineRun, Trade
 from utils.exceptions import (
     WatchlistFullError, 
     DuplicateStockError, 
@@ -151,6 +154,22 @@ class TestPriceRepository:
         history_start = repo.get_historical_prices("BBCA.JK", start_date=datetime(2024, 1, 4, tzinfo=timezone.utc))
         assert len(history_start) == 2
 
+    def test_get_historical_prices_raw(self, mongo_test_db):
+        stock_repo = StockRepository(mongo_test_db)
+        stock_repo.add_stock(StockCreate(symbol="BBCA.JK", name="Bank Central Asia"))
+        
+        repo = PriceRepository(mongo_test_db)
+        for i in range(1, 6):
+            repo.upsert_price(DailyPriceBase(
+                symbol="BBCA.JK", date=datetime(2024, 1, i, tzinfo=timezone.utc),
+                open=10000, high=10100, low=9900, close=10000 + i, 
+                volume=1000, adjusted_close=10000
+            ))
+            
+        raw = repo.get_historical_prices_raw("BBCA.JK", limit=3)
+        assert [d["close"] for d in raw] == [10003, 10004, 10005]
+        assert "_id" not in raw[0] and "fetched_at" not in raw[0]
+
     def test_delete_all_for_stock(self, mongo_test_db):
         stock_repo = StockRepository(mongo_test_db)
         stock_repo.add_stock(StockCreate(symbol="BBCA.JK", name="Bank Central Asia"))
@@ -220,4 +239,189 @@ class TestPipelineRepository:
         # Ensure comparison is aware
         assert history[0].date == datetime(2024, 1, 5, tzinfo=timezone.utc)
 
+class TestBacktestRepository:
+    def test_bulk_save(self, mongo_test_db):
+        repo = BacktestRepository(mongo_test_db)
+        trade = {
+            "id": 0, "symbol": "BBCA.JK", "entry_date": datetime(2024, 1, 2),
+            "entry_price": 9000.0, "sl_price": 8500.0, "tp_price": 10000.0, "cost": 900000.0,
+            "exit_date": datetime(2024, 1, 9), "exit_price": 9500.0, "qty": 100,
+            "pnl_rupiah": 50000.0, "pnl_percent": 5.56, "hold_days": 7, "exit_reason": "TP",
+        }
+        repo.bulk_save("run_1", "vcp", [trade] * 5, chunk_size=2)
+        
+        saved = repo.get_trades_by_run("run_1")
+        assert len(saved) == 5
+        assert saved[0].strategy == "vcp"
+        assert saved[0].exit_reason == "TP"
+        assert "cost" not in mongo_test_db.backtest_trades.find_one()
+
+
+class TestTradeRepository:
+    def test_upsert_draft_replaces_existing(self, mongo_test_db):
+        repo = TradeRepository(mongo_test_db)
+        draft = Trade(
+            symbol="BBCA.JK", entry_date=datetime(2024, 1, 2), qty=100, qty_remaining=100,
+            entry_price=9000.0, strategy="vcp", risk_percent=1.0, status="draft",
+        )
+        first_id = repo.upsert_draft(draft)
+        second_id = repo.upsert_draft(draft.model_copy(update={"qty": 200, "qty_remaining": 200}))
+        
+        drafts = repo.get_draft_trades("BBCA.JK")
+        assert first_id == second_id
+        assert len(drafts) == 1
+        assert drafts[0].qty == 200
+        assert drafts[0].id == first_id
+
+    def test_get_latest_trade_by_symbol_prefers_open(self, mongo_test_db):
+        repo = TradeRepository(mongo_test_db)
+        base = dict(symbol="BBCA.JK", qty=100, qty_remaining=100, entry_price=9000.0, strategy="vcp", risk_percent=1.0)
+        repo.insert_trade(Trade(entry_date=datetime(2024, 1, 2), status="open", **base))
+        repo.insert_trade(Trade(entry_date=datetime(2024, 2, 2), status="closed", **base))
+        repo.insert_trade(Trade(entry_date=datetime(2024, 3, 2), status="draft", **base))
+        
+        assert repo.get_latest_trade_by_symbol("BBCA.JK").status == "open"
+        latest_closed = repo.get_latest_trade_by_symbol("BBCA.JK", statuses=("closed",))
+        assert latest_closed.entry_date == datetime(2024, 2, 2)
+        assert repo.get_latest_trade_by_symbol("TLKM.JK") is None
+
+    def test_get_trades_for_stats(self, mongo_test_db):
+        from db.schemas import TradeLeg
+        repo = TradeRepository(mongo_test_db)
+        base = dict(symbol="BBCA.JK", entry_date=datetime(2024, 1, 2), qty=100, qty_remaining=100,
+                    entry_price=9000.0, strategy="vcp", risk_percent=1.0)
+        leg = TradeLeg(qty=50, exit_price=9500.0, exit_date=datetime(2024, 1, 5),
+                       pnl_rupiah=25000.0, pnl_percent=5.6)
+        repo.insert_trade(Trade(status="closed", pnl_rupiah=1000.0, **base))
+        repo.insert_trade(Trade(status="open", legs=[leg], pnl_rupiah=25000.0, **base))
+        repo.insert_trade(Trade(status="open", legs=[leg], **base))
+        repo.insert_trade(Trade(status="open", **base))
+        
+        everything = repo.get_all_trades()
+        expected = [t for t in everything if t.status == "closed" or (t.legs and t.pnl_rupiah)]
+        assert [t.id for t in repo.get_trades_for_stats()] == [t.id for t in expected]
+        assert len(expected) == 2
+
+    def test_open_trades_carry_id(self, mongo_test_db):
+        repo = TradeRepository(mongo_test_db)
+        trade_id = repo.insert_trade(Trade(symbol="BBCA.JK", entry_date=datetime(2024, 1, 2), qty=100,
+                                           qty_remaining=100, entry_price=9000.0, strategy="vcp",
+                                           risk_percent=1.0, status="open"))
+        
+        assert [t.id for t in repo.get_open_trades()] == [trade_id]
+        assert "id" not in mongo_test_db.trades.find_one()
+
+    def test_partial_close_to_zero_closes_in_one_update(self, mongo_test_db):
+        from journal.trade_manager import TradeManager
+        repo = TradeRepository(mongo_test_db)
+        trade_id = repo.insert_trade(Trade(symbol="BBCA.JK", entry_date=datetime(2024, 1, 2), qty=100,
+                                           qty_remaining=100, entry_price=9000.0, strategy="vcp",
+                                           risk_percent=1.0, status="open"))
+        manager = TradeManager(repo)
+        leg = dict(exit_price=9500.0, exit_date=datetime(2024, 1, 5), fees=0)
+        
+        assert manager.partial_close(trade_id, {**leg, "qty": 40})["status"] == "open"
+        res = manager.partial_close(trade_id, {**leg, "qty": 60})
+        
+        trade = repo.get_trade(trade_id)
+        assert res["status"] == "closed" and trade.status == "closed"
+        assert [l.qty for l in trade.legs] == [40, 60]
+        assert trade.qty_remaining == 0
+        assert trade.pnl_rupiah == res["pnl_rupiah"]
+
+    def test_closed_trade_columns(self, mongo_test_db):
+        from db.repositories.trade_repo import clear_closed_trades_cache
+        clear_closed_trades_cache()
+        repo = TradeRepository(mongo_test_db)
+        repo.insert_trade(Trade(symbol="BBCA.JK", entry_date=datetime(2024, 1, 2), exit_date=datetime(2024, 1, 9),
+                                qty=100, qty_remaining=0, entry_price=9000.0, exit_price=9500.0,
+                                strategy="vcp", risk_percent=1.0, status="closed", pnl_rupiah=50000.0,
+                                holding_days=7))
+        
+        columns = repo.get_closed_trade_columns()
+        assert list(columns["strategy"]) == ["vcp"]
+        assert columns["pnl_rupiah"].tolist() == [50000.0]
+        assert columns["holding_days"].tolist() == [7.0]
+        assert repo.get_closed_trade_columns() is columns
+        clear_closed_trades_cache()
 
+    def test_closed_trade_dicts_cached_until_write(self, mongo_test_db):
+        from db.repositories.trade_repo import clear_closed_trades_cache
+        clear_closed_trades_cache()
+        repo = TradeRepository(mongo_test_db)
+        closed = Trade(
+            symbol="BBCA.JK", entry_date=datetime(2024, 1, 2), qty=100, qty_remaining=0,
+            entry_price=9000.0, strategy="vcp", risk_percent=1.0, status="closed", pnl_rupiah=5000.0,
+        )
+        repo.insert_trade(closed)
+        first = repo.get_closed_trade_dicts()
+        assert repo.get_closed_trade_dicts() is first
+        assert first[0]["pnl_rupiah"] == 5000.0
+        
+        repo.insert_trade(closed)
+        assert len(repo.get_closed_trade_dicts()) == 2
+        clear_closed_trades_cache()
+
+
+class TestSignalRepository:
+    def test_get_latest_signal_cached_until_upsert(self, mongo_test_db):
+        from engine.signal_generator import FinalSignal
+        repo = SignalRepository(mongo_test_db)
+        signal = FinalSignal(
+            symbol="TLKM.JK", date=datetime(2024, 1, 2, tzinfo=timezone.utc), verdict="BUY",
+            strategy_source="vcp", strategy_sources=["vcp"], entry_price=4000.0, sl_price=3800.0,
+            tp_price=4400.0, rr_ratio=2.0, tech_score=80.0, confidence="High", reasoning="test",
+        )
+        repo.upsert_signal(signal)
+        assert repo.get_latest_signal("TLKM.JK").verdict == "BUY"
+        
+        # Direct writes bypass the cache ...
+        mongo_test_db.signals.update_many({}, {"$set": {"verdict": "HOLD"}})
+        assert repo.get_latest_signal("TLKM.JK").verdict == "BUY"
+        
+        # ... but upserting through the repository invalidates it
+        signal.verdict = "SELL"
+        repo.upsert_signal(signal)
+        assert repo.get_latest_signal("TLKM.JK").verdict == "SELL"
+
+    def test_get_latest_signal_cache_is_per_collection(self, mongo_test_db):
+        from engine.signal_generator import FinalSignal
+        other_db = mongo_test_db.client["caktykbot_test_other"]
+        other_db.client.drop_database(other_db.name)
+        signal = FinalSignal(
+            symbol="BBCA.JK", date=datetime(2024, 1, 2, tzinfo=timezone.utc), verdict="BUY",
+            strategy_source="vcp", strategy_sources=["vcp"], entry_price=9000.0, sl_price=8500.0,
+            tp_price=10000.0, rr_ratio=2.0, tech_score=80.0, confidence="High", reasoning="test",
+        )
+        SignalRepository(mongo_test_db).upsert_signal(signal)
+        assert SignalRepository(mongo_test_db).get_latest_signal("BBCA.JK").verdict == "BUY"
+        
+        # Same symbol in another database must not be served from the first one's entry
+        assert SignalRepository(other_db).get_latest_signal("BBCA.JK") is None
+        
+        signal.verdict = "SELL"
+        SignalRepository(other_db).upsert_signal(signal)
+        assert SignalRepository(other_db).get_latest_signal("BBCA.JK").verdict == "SELL"
+        assert SignalRepository(mongo_test_db).get_latest_signal("BBCA.JK").verdict == "BUY"
+
+    def test_get_today_signals_cached_until_upsert(self, mongo_test_db):
+        from db.repositories.signal_repo import clear_today_signals_cache
+        from engine.signal_generator import FinalSignal
+        clear_today_signals_cache()
+        repo = SignalRepository(mongo_test_db)
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        signal = FinalSignal(
+            symbol="TLKM.JK", date=today, verdict="BUY",
+            strategy_source="vcp", strategy_sources=["vcp"], entry_price=4000.0, sl_price=3800.0,
+            tp_price=4400.0, rr_ratio=2.0, tech_score=80.0, confidence="High", reasoning="test",
+        )
+        repo.upsert_signal(signal)
+        assert [s.symbol for s in repo.get_today_signals()] == ["TLKM.JK"]
+        
+        mongo_test_db.signals.delete_many({})
+        assert len(repo.get_today_signals()) == 1
+        
+        signal.symbol = "BBRI.JK"
+        repo.upsert_signal(signal)
+        assert [s.symbol for s in repo.get_today_signals()] == ["BBRI.JK"]
+        clear_today_signals_cache()
@@ -150,3 +150,21 @@ class TestPipelineRunSchema:
                 success_count=0,
                 fail_count=0
             )
+
+
+class TestDumpModels:
+    """Test bulk model serialization helper."""
+
+    def test_matches_model_dump(self):
+        """Test dump_models equals per-row model_dump."""
+        from utils.serialization import dump_models
+
+        prices = [
+            DailyPriceBase(
+                symbol="BBCA.JK", date=datetime(2024, 1, d, tzinfo=timezone.utc),
+                open=100, high=110, low=90, close=105, volume=1000, adjusted_close=105
+            )
+            for d in (2, 3)
+        ]
+        assert dump_models(prices) == [p.model_dump() for p in prices]
+        assert dump_models([]) == []
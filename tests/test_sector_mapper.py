@@ -71,3 +71,17 @@ class TestSectorMapper:
         assert not res["allowed"]
         assert res["count"] == 2
         assert "Sector limit" in res["message"]
+
+
+def test_get_sector_info_cached():
+    from unittest.mock import patch
+    from risk.sector_mapper import clear_sector_cache, get_sector_info_cached
+
+    mock_db = MagicMock()
+    mock_db.sector_map.find_one.return_value = {"sector": "Banking", "market_cap_category": "large"}
+    clear_sector_cache()
+    with patch("risk.sector_mapper.get_database", return_value=mock_db):
+        assert get_sector_info_cached("BBCA.JK") == ("Banking", "large")
+        assert get_sector_info_cached("BBCA.JK") == ("Banking", "large")
+    assert mock_db.sector_map.find_one.call_count == 1
+    clear_sector_cache()
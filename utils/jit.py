@@ -0,0 +1,23 @@
+"""Optional Numba JIT support.
+
+Numeric kernels are decorated with ``njit`` from this module. When numba is
+installed they are compiled to machine code; otherwise the decorator is a
+no-op and the kernels run as plain Python with identical results.
+"""
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - depends on environment
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit`` (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -0,0 +1,24 @@
+"""Bulk Pydantic model serialization.
+
+Dumping a list of models through a cached ``TypeAdapter(list[Model])`` runs
+the whole loop inside pydantic-core instead of calling ``model_dump()`` once
+per row from Python. The output is identical.
+"""
+
+from functools import lru_cache
+from typing import List
+
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type) -> TypeAdapter:
+    """Build (once per model class) the adapter for ``list[model]``."""
+    return TypeAdapter(list[model])
+
+
+def dump_models(models: List[BaseModel]) -> List[dict]:
+    """Equivalent of ``[m.model_dump() for m in models]`` for a homogeneous list."""
+    if not models:
+        return []
+    return _list_adapter(type(models[0])).dump_python(models)